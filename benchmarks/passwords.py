@@ -0,0 +1,84 @@
+"""
+Concurrent login benchmark, bcrypt checks inline on the request workers
+against the bounded `PasswordHashPool`.
+
+A burst of logins and a steady stream of health checks share the same
+request workers, the health check latency shows whether logins pin them.
+
+Run from the project root:
+
+    python -m benchmarks.passwords [logins] [request_workers] [rounds]
+"""
+import os
+import statistics
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter, sleep
+
+import bcrypt
+
+from simple_crud_api.utils.security.passwd import PasswordHasherBusy, PasswordHashPool
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def run(name: str, login, logins: int, request_workers: int):
+    workers = ThreadPoolExecutor(request_workers)
+    health_latencies = []
+    rejected = 0
+    done = threading.Event()
+
+    def health_checks():
+        # one check every 10 ms while the logins run
+        while not done.is_set():
+            queued_at = perf_counter()
+            workers.submit(lambda: None).result()
+            health_latencies.append(perf_counter() - queued_at)
+            sleep(0.01)
+
+    checker = threading.Thread(target=health_checks)
+    start = perf_counter()
+    checker.start()
+    futures = [workers.submit(login) for _ in range(logins)]
+    for future in futures:
+        try:
+            future.result()
+        except PasswordHasherBusy:
+            rejected += 1
+    elapsed = perf_counter() - start
+    done.set()
+    checker.join()
+    workers.shutdown()
+
+    served = logins - rejected
+    print(
+        f"{name:<10} {elapsed * 1000:>9.1f} ms {served / elapsed:>9.1f} logins/s "
+        f"{rejected:>6} rejected  health p50 {statistics.median(health_latencies) * 1000:>7.1f} ms "
+        f"p99 {percentile(health_latencies, 0.99) * 1000:>7.1f} ms"
+    )
+
+
+def main(logins: int = 200, request_workers: int = 16, rounds: int = 12):
+    password = b"Password123"
+    hashed = bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+    hash_workers = os.cpu_count() or 2
+    pool = PasswordHashPool(hash_workers, max_queue=hash_workers * 2)
+
+    print(
+        f"{logins} concurrent logins, {request_workers} request workers, "
+        f"bcrypt {rounds} rounds, pool of {hash_workers} threads"
+    )
+    run("inline", lambda: bcrypt.checkpw(password, hashed), logins, request_workers)
+    run("pooled", lambda: pool.run(bcrypt.checkpw, password, hashed), logins, request_workers)
+    print(f"pool stats {pool.get_stats()}")
+
+
+if __name__ == "__main__":
+    args = [int(x) for x in sys.argv[1:4]]
+    main(*args)
@@ -0,0 +1,88 @@
+"""
+Task serialization benchmark, compiled `RowSerializer` against the column 
+reflecting `to_dict` it replaced.
+
+Run from the project root:
+
+    python -m benchmarks.serializer [rows]
+"""
+import sys
+from time import perf_counter
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from simple_crud_api.database import Base
+from simple_crud_api.models import user, address, validation
+from simple_crud_api.models.task import Task, TaskStatus, task_serializer
+
+
+def reflecting_to_dict(task: Task) -> dict:
+    """
+    `Task.to_dict` before the serializer layer.
+    """
+    data = {}
+    for c in task.get_response_fields():
+        if c == "status":
+            data.update({c: getattr(task, c).value})
+        else:
+            data.update({c: getattr(task, c)})
+    return data
+
+
+def timed(name: str, func, rows):
+    start = perf_counter()
+    for row in rows:
+        func(row)
+    elapsed = perf_counter() - start
+    print(f"{name:<40} {elapsed * 1000:>9.1f} ms {len(rows) / elapsed:>12,.0f} rows/s")
+    return elapsed
+
+
+def main(count: int = 100_000):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    statuses = list(TaskStatus)
+    with engine.begin() as connection:
+        connection.execute(insert(Task), [
+            {
+                "description": f"task {i}",
+                "body": "lorem ipsum " * 20,
+                "status": statuses[i % len(statuses)],
+                "created_by_id": i % 10,
+                "assigned_to_id": i % 100,
+            }
+            for i in range(count)
+        ])
+
+    print(f"Loading and serializing {count:,} tasks")
+    with Session(engine) as session:
+        start = perf_counter()
+        entities = session.scalars(select(Task)).all()
+        [reflecting_to_dict(task) for task in entities]
+        baseline = perf_counter() - start
+        print(f"{'entities, reflecting to_dict':<40} {baseline * 1000:>9.1f} ms")
+    
+    with Session(engine) as session:
+        start = perf_counter()
+        rows = session.execute(select(*Task.__table__.columns)).all()
+        task_serializer.many(rows)
+        elapsed = perf_counter() - start
+        print(f"{'core rows, RowSerializer.many':<40} {elapsed * 1000:>9.1f} ms {baseline / elapsed:>12.1f}x")
+
+    with Session(engine) as session:
+        entities = session.scalars(select(Task)).all()
+
+    print(f"\nSerializing {count:,} loaded tasks")
+    baseline = timed("entity, reflecting to_dict", reflecting_to_dict, entities)
+    for name, func, data in [
+        ("entity, RowSerializer", task_serializer, entities),
+        ("core row, RowSerializer", task_serializer.compile(layout=rows[0]._fields), rows),
+        ("core row, RowSerializer (3 fields)", task_serializer.compile(("id", "description", "status"), rows[0]._fields), rows),
+    ]:
+        elapsed = timed(name, func, data)
+        print(f"{'':<40} {baseline / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -4,7 +4,7 @@ from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 
 from alembic import context
-from simple_crud_api.models import user, address, validation, task
+from simple_crud_api.models import user, address, validation, task, task_stat, task_sync, task_outbox, task_archive, task_history
 from simple_crud_api.database import Base
 
 # this is the Alembic Config object, which provides
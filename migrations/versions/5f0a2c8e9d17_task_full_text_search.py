@@ -0,0 +1,35 @@
+"""task full text search
+
+Revision ID: 5f0a2c8e9d17
+Revises: 8d21f06ab7c3
+Create Date: 2026-10-18 13:47:52.204381
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f0a2c8e9d17'
+down_revision: Union[str, None] = '8d21f06ab7c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'mysql':
+        op.create_index('ix_task_description_body_fulltext', 'task', ['description', 'body'], unique=False, mysql_prefix='FULLTEXT')
+    elif dialect == 'sqlite':
+        op.execute("CREATE VIRTUAL TABLE task_fts USING fts5(description, body)")
+        op.execute("INSERT INTO task_fts (rowid, description, body) SELECT id, description, body FROM task")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'mysql':
+        op.drop_index('ix_task_description_body_fulltext', table_name='task')
+    elif dialect == 'sqlite':
+        op.execute("DROP TABLE task_fts")
@@ -3,7 +3,7 @@ from datetime import timedelta
 
 from dotenv import load_dotenv
 from flask import (
-    Flask, g, 
+    Flask, g, jsonify,
     redirect, url_for, 
     render_template, session
 )
@@ -24,6 +24,17 @@ from .routes import (
     manager
 )
 from .database import db_session, init_db
+from .utils.identity import load_user_identity
+from .utils.security.passwd import (
+    PasswordHasherBusy,
+    load_hash_rounds,
+    set_hash_rounds
+)
+from .utils.tokens import (
+    get_token_user,
+    is_token_revoked,
+    token_claims
+)
 from . import settings
 
 
@@ -84,14 +95,41 @@ def create_app(test_config=None):
     })
     cache.init_app(app)
     
+    # bcrypt work factor calibrated once for the processes sharing the cache
+    if settings.PASSWORD_HASH_CALIBRATE == "1":
+        with app.app_context():
+            set_hash_rounds(load_hash_rounds(
+                float(settings.PASSWORD_HASH_TARGET_MS), 
+                int(settings.PASSWORD_HASH_MIN_ROUNDS)
+            ))
+    
     @jwt.user_identity_loader
     def user_identity_lookup(user):
         return str(user.id)
     
+    @jwt.additional_claims_loader
+    def additional_claims_callback(user):
+        return token_claims(user)
+    
+    @jwt.token_in_blocklist_loader
+    def token_in_blocklist_callback(_jwt_header, jwt_data):
+        return is_token_revoked(jwt_data)
+    
     @jwt.user_lookup_loader
     def user_lookup_callback(_jwt_header, jwt_data):
-        identity = jwt_data["sub"]
-        return db_session.query(User).filter_by(id=identity).one_or_none()
+        # views with `token_claims` don't need the user row
+        token_user = get_token_user(jwt_data)
+        if token_user:
+            return token_user
+        try:
+            identity = int(jwt_data["sub"])
+        except ValueError:
+            return None
+        return load_user_identity(identity)
+
+    @app.errorhandler(PasswordHasherBusy)
+    def password_hasher_busy(e):
+        return jsonify(message="Server busy, retry later"), 503, {"Retry-After": "1"}
 
     app.register_blueprint(index.bp)
     app.register_blueprint(auth_user.bp)
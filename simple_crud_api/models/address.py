@@ -1,6 +1,7 @@
 from sqlalchemy import Integer, String, Column, ForeignKey
 from sqlalchemy.orm import relationship
 from ..database import Base
+from ..serializer.rows import RowSerializer
 
 class Address(Base):
     __tablename__ = "address"
@@ -29,4 +30,7 @@ class Address(Base):
         return [c.name for c in self.__table__.columns]
     
     def to_dict(self):
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
\ No newline at end of file
+        return address_serializer(self)
+
+
+address_serializer = RowSerializer(Address)
\ No newline at end of file
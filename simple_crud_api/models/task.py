@@ -1,15 +1,24 @@
+from datetime import datetime, timezone
 from enum import Enum
 
 from sqlalchemy import (
+    BigInteger,
     Column, 
+    DateTime,
     Integer, 
     String,
     Enum as SQLEnum,
-    ForeignKey
+    ForeignKey,
+    Index
 )
 from sqlalchemy.orm import relationship
 
 from ..database import Base
+from ..serializer.rows import RowSerializer
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
 
 
 class TaskStatus(Enum):
@@ -22,6 +31,22 @@ class TaskStatus(Enum):
 
 class Task(Base):
     __tablename__ = 'task'
+    __table_args__ = (
+        # keyset pagination of role scoped task lists
+        Index("ix_task_created_by_id_id", "created_by_id", "id"),
+        Index("ix_task_assigned_to_id_id", "assigned_to_id", "id"),
+        # task list filters
+        Index("ix_task_status_id", "status", "id"),
+        Index("ix_task_assigned_by_id_id", "assigned_by_id", "id"),
+        Index("ix_task_created_by_id_status_id", "created_by_id", "status", "id"),
+        Index("ix_task_assigned_to_id_status_id", "assigned_to_id", "status", "id"),
+        # delta sync of role scoped task lists
+        Index("ix_task_change_seq", "change_seq"),
+        Index("ix_task_created_by_id_change_seq", "created_by_id", "change_seq"),
+        Index("ix_task_assigned_to_id_change_seq", "assigned_to_id", "change_seq"),
+        # full text search, SQLite uses the task_fts table instead
+        Index("ix_task_description_body_fulltext", "description", "body", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     description = Column(String(200))
@@ -35,6 +60,13 @@ class Task(Base):
     # Employee
     assigned_to_id = Column(Integer, ForeignKey("user.id", ondelete="SET NULL"), nullable=True)
     
+    # incremented by every update statement, keys the task JSON fragment cache
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    
+    # sequence number of the last change (see `utils.sync`), and its time
+    change_seq = Column(BigInteger, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime, nullable=True, default=utcnow)
+    
     created_by = relationship("User", foreign_keys=[created_by_id], back_populates="task_created_by")
     assigned_by = relationship("User", foreign_keys=[assigned_by_id], back_populates="task_assigned_by")
     assigned_to = relationship("User", foreign_keys=[assigned_to_id], back_populates="task_received")
@@ -47,10 +79,7 @@ class Task(Base):
         return all_fields
     
     def to_dict(self):
-        data = {}
-        for c in self.get_response_fields():
-            if c == "status":
-                data.update({c: getattr(self, c).value})
-            else:
-                data.update({c: getattr(self, c)})
-        return  data
\ No newline at end of file
+        return task_serializer(self)
+
+
+task_serializer = RowSerializer(Task, exclude=["change_seq"])
\ No newline at end of file
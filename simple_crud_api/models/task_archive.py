@@ -0,0 +1,41 @@
+from sqlalchemy import (
+    BigInteger,
+    Column, 
+    DateTime,
+    Integer, 
+    String,
+    Enum as SQLEnum,
+    Index
+)
+
+from ..database import Base
+from ..serializer.rows import RowSerializer
+from .task import TaskStatus
+
+
+class TaskArchive(Base):
+    """
+    Tasks done for long, moved out of the task table by the 
+    `task archive-tasks` command. Same columns as task.
+    """
+    __tablename__ = 'task_archive'
+    __table_args__ = (
+        # role scoped archived task lists
+        Index("ix_task_archive_created_by_id_id", "created_by_id", "id"),
+        Index("ix_task_archive_assigned_to_id_id", "assigned_to_id", "id"),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    description = Column(String(200))
+    body = Column(String(2000))
+    status = Column(SQLEnum(TaskStatus))
+    created_by_id = Column(Integer, nullable=True)
+    assigned_by_id = Column(Integer, nullable=True)
+    assigned_to_id = Column(Integer, nullable=True)
+    version = Column(Integer, nullable=False)
+    change_seq = Column(BigInteger, nullable=False)
+    updated_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, nullable=False)
+
+
+task_archive_serializer = RowSerializer(TaskArchive, exclude=["change_seq"])
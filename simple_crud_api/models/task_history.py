@@ -0,0 +1,36 @@
+from sqlalchemy import (
+    Column, 
+    DateTime,
+    Integer, 
+    String,
+    Text,
+    Index
+)
+
+from ..database import Base
+from ..serializer.rows import RowSerializer
+
+
+class TaskHistory(Base):
+    """
+    Append only audit trail of tasks, one row per changed field, or per
+    created, deleted or archived task (no field).
+    """
+    __tablename__ = 'task_history'
+    __table_args__ = (
+        Index("ix_task_history_task_id_id", "task_id", "id"),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    task_id = Column(Integer, nullable=False)
+    # create, update, assign, delete or archive
+    action = Column(String(20), nullable=False)
+    field = Column(String(50), nullable=True)
+    old_value = Column(Text, nullable=True)
+    new_value = Column(Text, nullable=True)
+    # user making the change, none for commands
+    user_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+
+
+task_history_serializer = RowSerializer(TaskHistory)
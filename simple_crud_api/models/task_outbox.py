@@ -0,0 +1,37 @@
+from sqlalchemy import (
+    Column, 
+    DateTime,
+    Integer, 
+    String,
+    Text,
+    Index
+)
+
+from ..database import Base
+
+
+class TaskOutbox(Base):
+    """
+    Task change waiting to be sent to a webhook.
+    
+    Written in the transaction of the task write, sent and deleted by the
+    `task dispatch-webhooks` command. Changes of a task are sent in order
+    to every webhook, `failed_at` is set once the retries are exhausted.
+    """
+    __tablename__ = 'task_outbox'
+    __table_args__ = (
+        Index("ix_task_outbox_url_task_id_id", "url", "task_id", "id"),
+        Index("ix_task_outbox_next_attempt_at", "next_attempt_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    url = Column(String(500), nullable=False)
+    task_id = Column(Integer, nullable=False)
+    # create, update, assign or delete
+    action = Column(String(20), nullable=False)
+    # JSON request body
+    payload = Column(Text, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False)
+    next_attempt_at = Column(DateTime, nullable=False)
+    failed_at = Column(DateTime, nullable=True)
@@ -0,0 +1,34 @@
+from sqlalchemy import (
+    Column, 
+    Integer, 
+    String,
+    Enum as SQLEnum,
+    UniqueConstraint
+)
+
+from ..database import Base
+from .task import TaskStatus
+
+
+class TaskStat(Base):
+    """
+    Number of tasks per status, per assignee and per creator.
+    
+    Maintained in the transaction of every task write, rebuilt by the
+    `task rebuild-stats` command.
+    """
+    __tablename__ = 'task_stat'
+    __table_args__ = (
+        UniqueConstraint("scope", "user_id", "status", name="uq_task_stat_scope_user_id_status"),
+    )
+    
+    ASSIGNEE = "assignee"
+    CREATOR = "creator"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # assignee or creator
+    scope = Column(String(20), nullable=False)
+    # 0 for tasks without assignee (creator)
+    user_id = Column(Integer, nullable=False)
+    status = Column(SQLEnum(TaskStatus), nullable=False)
+    count = Column(Integer, nullable=False, default=0)
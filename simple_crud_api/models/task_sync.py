@@ -0,0 +1,45 @@
+from sqlalchemy import (
+    BigInteger,
+    Column, 
+    DateTime,
+    Integer, 
+    String,
+    Index
+)
+
+from ..database import Base
+
+
+class TaskSequence(Base):
+    """
+    Counter of task change sequence numbers.
+    
+    Incremented in the transaction of every task write, the row stays 
+    locked until commit so sequence numbers are committed in order.
+    """
+    __tablename__ = 'task_sequence'
+    
+    TASK = "task"
+    
+    name = Column(String(50), primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
+
+
+class TaskTombstone(Base):
+    """
+    Deleted task, for the delta sync of task lists.
+    """
+    __tablename__ = 'task_tombstone'
+    __table_args__ = (
+        Index("ix_task_tombstone_change_seq", "change_seq"),
+        Index("ix_task_tombstone_created_by_id_change_seq", "created_by_id", "change_seq"),
+        Index("ix_task_tombstone_assigned_to_id_change_seq", "assigned_to_id", "change_seq"),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    task_id = Column(Integer, nullable=False)
+    change_seq = Column(BigInteger, nullable=False)
+    # owners of the task when deleted, to scope tombstones like tasks
+    created_by_id = Column(Integer, nullable=True)
+    assigned_to_id = Column(Integer, nullable=True)
+    deleted_at = Column(DateTime, nullable=False)
@@ -12,12 +12,15 @@ from simple_crud_api.database import Base
 
 
 from ..models.task import Task
-from ..utils.security.passwd import generate_hashed_password, check_password
+from ..serializer.rows import RowSerializer
+from ..utils.security.passwd import generate_hashed_password, check_password, needs_rehash
 from ..utils.user import UserType
 
 class User(Base):
     __tablename__ = "user"
     
+    # never part of a response
+    private_fields = ['password', 'active', 'account_activation', 'account_activation_id', 'token_version']
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     username = Column(String(50), unique=True)
@@ -32,6 +35,9 @@ class User(Base):
     account_activation = Column(Boolean, default=False, nullable=True)
     account_activation_id = Column(String(36), nullable=True)
     
+    # bumped to revoke the tokens issued before, see `utils.tokens`
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
+    
     # self relation
     
     address = relationship(
@@ -84,13 +90,22 @@ class User(Base):
     def check_password(self, raw_password: str) -> bool:
         return check_password(raw_password, self.password)
     
+    def password_needs_rehash(self) -> bool:
+        """
+        Whether the password hash work factor differs from the current one.
+        """
+        return needs_rehash(self.password)
+    
     @staticmethod
     def make_passsword(raw_password: str) -> str:
         return generate_hashed_password(raw_password)
     
+    @classmethod
+    def get_response_fields(cls) -> list[str]:
+        return [c.name for c in cls.__table__.columns if c.name not in cls.private_fields]
+    
     def to_dict(self):
-        data = {c.name: getattr(self, c.name) for c in self.__table__.columns}
-        for key in ['password', 'active', 'account_activation', 'account_activation_id']:
-            del data[key]
-        data['role'] = self.role.value
-        return data
\ No newline at end of file
+        return user_serializer(self)
+
+
+user_serializer = RowSerializer(User, exclude=User.private_fields)
\ No newline at end of file
@@ -15,6 +15,7 @@ from flask_jwt_extended import (
     create_refresh_token,
     jwt_required,
 )
+import click
 import pyotp
 
 from .. import settings
@@ -37,6 +38,9 @@ from ..models.address import Address
 from ..models.validation import Validation
 from ..utils.message import message_collector
 from ..utils.validation import password_validation
+from ..utils.identity import invalidate_user_identity
+from ..utils.tokens import bump_token_version, token_revocations
+from ..utils.security.passwd import PasswordHasherBusy, calibrate_hash_rounds
 from ..utils.mail import (
     check_mail_exists, 
     send_account_activation_mail,
@@ -222,6 +226,16 @@ class LoginView(MethodView):
         if not user.check_password(serializer.password):
             return jsonify(message="Invalid username and password"), 400
         
+        # move the hash to the current work factor, while the password is known
+        if user.password_needs_rehash():
+            try:
+                user.password = User.make_passsword(serializer.password)
+                db_session.commit()
+                invalidate_user_identity(user.id)
+            except PasswordHasherBusy:
+                # busy, rehashed on a later login
+                pass
+        
         data = OrderedDict()
         data["message"] = "User successfully logged in"
         data["access_token"] = create_access_token(identity=user, fresh=True)
@@ -283,8 +297,11 @@ def reset_logged_user_password():
         return jsonify(message="Your last password is incorrect."), 400
     
     current_user.password = User.make_passsword(password_serializer.new_password)
+    token_version = bump_token_version(current_user)
     db_session.add(current_user)
     db_session.commit()
+    invalidate_user_identity(current_user.id)
+    token_revocations.revoke(current_user.id, token_version)
     
     return jsonify(message="Password changed successfully"), 202
     
@@ -361,14 +378,19 @@ def reset_password_using_validation_id(val_id: str):
             return jsonify(message="Email ID doesn't match"), 400
             
         user.password = User.make_passsword(password)
+        token_version = bump_token_version(user)
         
         db_session.add(user)
         db_session.commit()
+        invalidate_user_identity(user.id)
+        token_revocations.revoke(user.id, token_version)
         
         validation.active = False
         db_session.add(validation)
         db_session.commit()
         
+    except PasswordHasherBusy:
+        raise
     except Exception as e:
         return jsonify(message=[
             "Invalid link",
@@ -390,6 +412,20 @@ def soft_delete_user():
         return jsonify(message="User already deleted"), 302
      
     current_user.active = False
+    token_version = bump_token_version(current_user)
     db_session.add(current_user)
     db_session.commit()
+    invalidate_user_identity(current_user.id)
+    token_revocations.revoke(current_user.id, token_version)
     return jsonify(message=f"User {current_user.username} successfully deleted"), 302
+
+
+@bp.cli.command("calibrate-password-hash")
+@click.option("--target-ms", type=float, default=None, help="Hash time target (PASSWORD_HASH_TARGET_MS).")
+def calibrate_password_hash_command(target_ms):
+    """
+    Find the bcrypt work factor of about the target hash time on this machine.
+    """
+    target_ms = target_ms or float(settings.PASSWORD_HASH_TARGET_MS)
+    rounds = calibrate_hash_rounds(target_ms, int(settings.PASSWORD_HASH_MIN_ROUNDS))
+    print(f"PASSWORD_HASH_ROUNDS={rounds}")
@@ -12,13 +12,18 @@ from flask_jwt_extended import (
 )
 
 from simple_crud_api.database import db_session
-from ..models.user import User
+from ..models.user import User, user_serializer
 from ..models.address import Address
 from ..serializer import (
     UserProfileSerializer,
     UserUpdateSerializer,
     AddressUpdateSerializer
 )
+from ..utils.identity import invalidate_user_identity
+from ..utils.fields import (
+    InvalidFields,
+    get_requested_fields
+)
 from ..utils.message import message_collector
 from ..utils.models import get_fields
 from ..utils.validation import phone_number_validation
@@ -34,11 +39,24 @@ bp = Blueprint("auth_user", __name__, url_prefix="/api/user")
 def user_detail_view():
     """
     Get user details
+    
+    `fields` selects the details to return, e.g. `fields=username,email`, 
+    address is only queried when requested.
     """
-    data = current_user.to_dict()
-    address = db_session.query(Address).filter_by(user_id=current_user.id).one_or_none()
-    if isinstance(address, Address):
-        data['address'] = address.to_dict()
+    try:
+        fields = get_requested_fields(request.args.get("fields"), User.get_response_fields() + ["address"])
+    except InvalidFields as e:
+        return jsonify(message=str(e)), 400
+    
+    if not fields:
+        data = current_user.to_dict()
+    else:
+        data = user_serializer(current_user, [f for f in fields if f != "address"])
+    
+    if not fields or "address" in fields:
+        address = db_session.query(Address).filter_by(user_id=current_user.id).one_or_none()
+        if isinstance(address, Address):
+            data['address'] = address.to_dict()
     return jsonify(details=data)
 
 
@@ -96,6 +114,7 @@ def update_profile():
     except Exception as e:
         messages(str(e))
         return jsonify(messages=messages()), 400
+    invalidate_user_identity(current_user.id)
     
     # check for address existence of current user
     address = db_session.query(Address).filter_by(user_id=current_user.id).one_or_none()
@@ -156,7 +175,6 @@ class UpdateView(MethodView):
                 return True
             return False
     
-    address = False
     @jwt_required(fresh=True)
     def post(self):
         
@@ -170,8 +188,6 @@ class UpdateView(MethodView):
         try:
             address_data: dict | None = user_data.pop("address", None)
             # print(address_data, user_data)
-            if address_data:
-                self.address = True
             
             address_serializer = None
             user_serializer = None
@@ -200,7 +216,7 @@ class UpdateView(MethodView):
                 if check_phone_exists(user_serializer.phone):
                     return jsonify(message="Phone number already exists"), 302
         
-        if self.address:
+        if address_data:
             address_query = db_session.query(Address).filter_by(user_id=current_user.id).one_or_none()
             if address_query:
                 # address update
@@ -227,6 +243,7 @@ class UpdateView(MethodView):
                 setattr(current_user, k, getattr(user_serializer, k))
             db_session.add(current_user)
             db_session.commit()
+            invalidate_user_identity(current_user.id)
         
         return jsonify(message="Updated successful"), 202
     
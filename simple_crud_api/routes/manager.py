@@ -11,26 +11,67 @@ from flask_jwt_extended import (
     jwt_required
 )
 
-from ..models.user import User
+from ..models.user import User, user_serializer
 from ..database import db_session
+from ..utils.fields import (
+    InvalidFields,
+    get_requested_fields
+)
+from ..utils.security.passwd import hash_pool
 from ..utils.user import UserType
 
 bp = Blueprint("manager", __name__, url_prefix="/api/manager")
 
 class ManagerView(MethodView):
+    
+    # authorize from the token claims, without loading the user
+    token_claims = True
+    
     def __init__(self):
         self.db_session = db_session
     
+    def user_query(self, fields: list[str] | None = None):
+        """
+        Query of rows with only the requested `fields`, all response fields by default.
+        """
+        return self.db_session.query(*[getattr(User, f) for f in fields or user_serializer.fields])
+    
+    def user_to_dict(self, user, fields: list[str] | None = None) -> dict:
+        return user_serializer(user, fields)
+    
     @jwt_required()
     def get(self):
         if current_user.role != UserType.Manager:
             return jsonify(message="Access denied"), 403
-        employee = self.db_session.query(User).filter_by(role=UserType.Employee.value).all()
-        team_lead = self.db_session.query(User).filter_by(role=UserType.TeamLead.value).all()
+        
+        try:
+            fields = get_requested_fields(request.args.get("fields"), User.get_response_fields())
+        except InvalidFields as e:
+            return jsonify(message=str(e)), 400
+        
+        employee = self.user_query(fields).filter_by(role=UserType.Employee.value).all()
+        team_lead = self.user_query(fields).filter_by(role=UserType.TeamLead.value).all()
         data = {
-            "employees": [user.to_dict() for user in employee],
-            "team_leads": [tl.to_dict() for tl in team_lead]
+            "employees": [self.user_to_dict(user, fields) for user in employee],
+            "team_leads": [self.user_to_dict(tl, fields) for tl in team_lead]
         }
         return jsonify(data), 200
     
-bp.add_url_rule("", view_func=ManagerView.as_view(name="manage-view"))
\ No newline at end of file
+
+class MetricsView(MethodView):
+    
+    # authorize from the token claims, without loading the user
+    token_claims = True
+    
+    @jwt_required()
+    def get(self):
+        """
+        Password hashing pool usage, of this process.
+        """
+        if current_user.role != UserType.Manager:
+            return jsonify(message="Access denied"), 403
+        return jsonify(password_hash=hash_pool.get_stats()), 200
+
+
+bp.add_url_rule("", view_func=ManagerView.as_view(name="manage-view"))
+bp.add_url_rule("/metrics", view_func=MetricsView.as_view(name="manager-metrics"))
\ No newline at end of file
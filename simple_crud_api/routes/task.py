@@ -1,25 +1,98 @@
+import time
+from hashlib import sha1
+
+import click
 from flask import (
     Blueprint,
+    Response,
+    current_app,
+    g,
     jsonify,
-    request
+    request,
+    stream_with_context
 )
 from flask_jwt_extended import (
     current_user,
     jwt_required,
 )
 from flask.views import MethodView
+from sqlalchemy import and_, delete, exists, func, insert, or_, select, update
 
+from .. import settings
 from ..cache import cache
 from ..database import db_session
 from ..models.user import User
 from ..models.task import Task
 from ..models.task import TaskStatus
+from ..models.task import task_serializer
+from ..models.task_archive import TaskArchive
+from ..models.task_history import TaskHistory
+from ..models.task_history import task_history_serializer
+from ..models.task_archive import task_archive_serializer
+from ..models.task_sync import TaskTombstone
 from ..serializer.task import (
+    TaskBulkAssignSerializer,
+    TaskBulkStatusSerializer,
     TaskCreateSerializer,
     TUESerializer,
     TUMSerializer
 )
+from ..utils.fields import (
+    InvalidFields,
+    get_requested_fields
+)
 from ..utils.mixins import UserVerifyMixin
+from ..utils.models import get_fields
+from ..utils.events import (
+    TaskEvent,
+    broker,
+    serialize_task_state
+)
+from ..utils.changes import (
+    TASK_STATE_FIELDS,
+    commit_task_changes,
+    record_task_change,
+    task_state
+)
+from ..utils.archive import archive_done_tasks
+from ..utils.policy import (
+    can_act,
+    task_allowed,
+    task_predicate
+)
+from ..utils.search import (
+    rebuild_search_index,
+    search_clause
+)
+from ..utils.versions import (
+    assigned_to_scope,
+    created_by_scope,
+    get_task_list_version,
+    get_task_version,
+    manager_scope,
+    start_task_version
+)
+from ..utils.response_cache import (
+    get_task_fragments,
+    get_task_list_cache_stats,
+    get_task_list_response,
+    set_task_list_response,
+    task_list_cache_key
+)
+from ..utils.sync import get_task_change_seq, next_task_change_seq
+from ..utils.webhooks import WebhookDispatcher
+from ..utils.stats import (
+    get_task_stats,
+    rebuild_task_stats
+)
+from ..utils.pagination import (
+    InvalidPageRequest,
+    decode_cursor,
+    decode_sync_token,
+    encode_cursor,
+    get_page_size
+)
+from ..utils.tokens import TokenUser
 from ..utils.user import UserType
 
 
@@ -27,57 +100,355 @@ bp = Blueprint("task" , __name__, url_prefix="/api/task")
 
 
 class TaskMixin:
+    """
+    View instances can be shared by concurrent requests (`init_every_request`),
+    per request state is kept in `flask.g`, never on `self`.
     
-    task_exists = False
+    Task views authorize from the token claims, the current user is a
+    `TokenUser`, the user row is never loaded.
+    """
     
-    def get_all_task(self, task_id: int | None = None):
-        # manager will get all task.
-        if task_id:
-            return db_session.query(self.task_model).filter_by(id=task_id).one_or_none()
-        return db_session.query(self.task_model).filter_by().all()
+    token_claims = True
     
-    def get_team_lead_task(self, task_id: int | None = None):
-        if task_id:
-            task = db_session.query(self.task_model).filter_by(id=task_id).one_or_none()
-            if task:
-                self.task_exists = True
-                return task if task.created_by_id == self.current_user.id else None
-            return None
-        return db_session.query(self.task_model).filter_by(created_by_id=self.current_user.id).all()
+    @property
+    def current_user(self) -> TokenUser:
+        return current_user
+    
+    @property
+    def current_user_role(self) -> UserType:
+        return current_user.role
+    
+    @property
+    def task_exists(self) -> bool:
+        """
+        Whether the task looked up by `get_task` exists, even if the 
+        current user can't access it.
+        """
+        return g.get("task_exists", False)
+    
+    @task_exists.setter
+    def task_exists(self, value: bool):
+        g.task_exists = value
     
-    def get_employee_task(self, task_id: int | None = None):
+    # query parameter -> task column, for filtering task list
+    task_filter_fields = {
+        "status": "status",
+        "assigned_to": "assigned_to_id",
+        "created_by": "created_by_id",
+        "assigned_by": "assigned_by_id",
+    }
+    
+    def task_query(self, fields: list[str] | None = None, model=None):
+        """
+        Query of task entities, or of rows with only the requested `fields`
+        (and the columns needed for pagination, role checks and ETags).
+        """
+        model = model or self.task_model
+        if not fields:
+            return db_session.query(model)
+        columns = {"id", "created_by_id", "assigned_to_id", "version", *fields}
+        return db_session.query(*[
+            getattr(model, c) for c in get_fields(model) if c in columns
+        ])
+    
+    def get_archived_task(self, task_id: int | None = None, filters: dict | None = None, fields: list[str] | None = None):
+        """
+        Returns the archived task with `task_id` whoever can access it, or
+        the role scoped query of archived tasks.
+        """
+        query = self.task_query(fields or task_archive_serializer.fields, TaskArchive)
         if task_id:
-            task = db_session.query(self.task_model).filter_by(id=task_id).one_or_none()
-            if task:
-                self.task_exists = True
-                return task if task.assigned_to_id == self.current_user.id else None
-            return None
-        return db_session.query(self.task_model).filter_by(assigned_to_id=self.current_user.id).all()
+            return query.filter_by(id=task_id).one_or_none()
+        return query.filter(self.get_task_scope(TaskArchive)).filter_by(**(filters or {}))
+    
+    def get_task(
+        self, 
+        task_id: int | None = None, 
+        filters: dict | None = None, 
+        fields: list[str] | None = None, 
+        action: str = "view"
+    ):
+        """
+        Returns the task with `task_id` if the current user can do `action`
+        on it, or the role scoped task query when no `task_id` is given.
+        
+        The task is read with the policy in the WHERE clause, only when 
+        nothing is found its existence is probed (`task_exists`), to tell
+        403 from 404.
+        """
+        query = self.task_query(fields).filter(self.get_task_scope(action=action))
+        if not task_id:
+            return query.filter_by(**(filters or {}))
+        task = query.filter(self.task_model.id == task_id).one_or_none()
+        if task is None:
+            self.task_exists = db_session.execute(
+                select(exists().where(self.task_model.id == task_id))
+            ).scalar()
+        return task
+    
+    def get_task_scope(self, model=None, action: str = "view"):
+        """
+        WHERE clause of the tasks the current user can do `action` on, 
+        `model` has the task owner columns (task by default).
+        """
+        return task_predicate(self.current_user, self.current_user_role, action, model or self.task_model)
     
-    def get_task(self, task_id: int | None = None):
+    def can(self, action: str) -> bool:
+        """
+        Whether the current user role can do `action` on any task.
+        """
+        return can_act(self.current_user_role, action)
+    
+    def get_task_list_scope(self) -> str:
+        """
+        Version scope of the current user task list.
+        """
         if self.current_user_role == UserType.Manager:
-            return self.get_all_task(task_id)
+            return manager_scope()
+        if self.current_user_role == UserType.TeamLead:
+            return created_by_scope(self.current_user.id)
+        return assigned_to_scope(self.current_user.id)
+    
+    def make_etag(self, *parts) -> str:
+        return sha1(":".join(str(x) for x in parts).encode()).hexdigest()
+    
+    def get_task_list_etag(self, scope: str, version: str) -> str:
+        """
+        Strong ETag of the task list response, changes with any write to a 
+        task of the user scope and with the query parameters.
+        """
+        return self.make_etag(
+            self.current_user.id, scope, version, 
+            sorted(request.args.items(multi=True)), self.wants_stream()
+        )
+    
+    def get_task_etag_hash(self, task_id: int, version: str) -> str:
+        return self.make_etag(
+            self.current_user.id, task_id, version, 
+            sorted(request.args.items(multi=True))
+        )
+    
+    def get_task_etag(self, version: int, etag_hash: str) -> str:
+        """
+        Strong ETag of a task response, `<version>.<hash>`: the task `version`
+        is what `If-Match` checks, the hash changes with any write to the task 
+        (and with the user and query parameters) and is what `If-None-Match`
+        checks, without reading the task.
+        """
+        return f"{version}.{etag_hash}"
+    
+    def get_not_modified_etag(self, etag_hash: str) -> str | None:
+        """
+        Task ETag of `If-None-Match` still current, None if there is none.
+        """
+        for etag in request.if_none_match.as_set():
+            if etag.partition(".")[2] == etag_hash:
+                return etag
+        return None
+    
+    def not_modified(self, etag: str) -> Response:
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    
+    def get_task_fields(self, args, serializer=task_serializer) -> list[str] | None:
+        """
+        Requested `fields`, the columns `serializer` returns (of the task 
+        model by default, of the archive for archived tasks).
+        """
+        return get_requested_fields(args.get("fields"), list(serializer.fields))
+    
+    def get_task_filters(self, args) -> dict:
+        """
+        Build task list filters from the query parameters, user ids 
+        accept `none` for unassigned tasks.
+        """
+        filters = {}
+        for param, field in self.task_filter_fields.items():
+            value = args.get(param)
+            if value is None:
+                continue
+            if field == "status":
+                value = self.get_task_status(value)
+                if not value:
+                    raise InvalidPageRequest("Invalid status")
+            elif value.lower() == "none":
+                value = None
+            else:
+                try:
+                    value = int(value)
+                except ValueError:
+                    raise InvalidPageRequest(f"Invalid {param}")
+            filters[field] = value
+        return filters
+    
+    def get_task_sort(self, args) -> str:
+        sort = args.get("sort", "id")
+        if sort not in ("id", "-id"):
+            raise InvalidPageRequest("Invalid sort: accepted values are 'id' and '-id'")
+        return sort
+    
+    def paginate_task(self, query, limit: int, cursor: dict | None = None, sort: str = "id", model=None):
+        """
+        Keyset pagination over task id, returns a page of tasks and the
+        cursor of the next page.
+        """
+        model = model or self.task_model
+        descending = sort == "-id"
+        if cursor:
+            if cursor.get("sort", "id") != sort:
+                raise InvalidPageRequest("Cursor doesn't match the sort order")
+            if descending:
+                query = query.filter(model.id < cursor["id"])
+            else:
+                query = query.filter(model.id > cursor["id"])
+        order = model.id.desc() if descending else model.id
+        tasks: list[Task] = query.order_by(order).limit(limit + 1).all()
         
-        elif self.current_user_role == UserType.TeamLead:
-            return self.get_team_lead_task(task_id)
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = encode_cursor(id=tasks[-1].id, sort=sort)
+        return tasks, next_cursor
+    
+    def sync_task(self, query, since: dict, limit: int, fields: list[str] | None = None) -> dict:
+        """
+        Tasks of the query changed after the sync token position `since`, 
+        ids of the tasks of the user deleted since then and the next sync token.
         
-        elif self.current_user_role == UserType.Employee:
-            return self.get_employee_task(task_id)
+        Both are read in change sequence order (then task id) up to the last 
+        committed sequence number, over the change sequence indexes, at most 
+        `limit` together. With `has_more` the sync token continues after the 
+        last change served, the next page is synced with it. `since=0` is a 
+        full sync, it also returns the tasks never changed since sync was 
+        added (change_seq 0).
+        """
+        last_seq = get_task_change_seq()
+        seq, task_id = since["seq"], since.get("id")
         
-    def set_current_user(self):
-        self.current_user: User = current_user
-        self.current_user_role: UserType = current_user.role
+        def after_since(model, id_column):
+            # without `id` every change at `seq` was served
+            if task_id is None:
+                return model.change_seq > seq
+            return or_(
+                model.change_seq > seq, 
+                and_(model.change_seq == seq, id_column > task_id)
+            )
+        
+        query = query.filter(self.task_model.change_seq <= last_seq)
+        if seq or task_id is not None:
+            query = query.filter(after_since(self.task_model, self.task_model.id))
+        tasks = (
+            query
+            .order_by(self.task_model.change_seq, self.task_model.id)
+            .limit(limit + 1)
+            .all()
+        )
+        deleted = db_session.execute(
+            select(TaskTombstone.task_id, TaskTombstone.change_seq)
+            .where(
+                after_since(TaskTombstone, TaskTombstone.task_id), 
+                TaskTombstone.change_seq <= last_seq, 
+                self.get_task_scope(TaskTombstone)
+            )
+            .order_by(TaskTombstone.change_seq, TaskTombstone.task_id)
+            .limit(limit + 1)
+        ).all()
         
-    def build_response_data(self, task: list[Task] | Task):
+        changes = sorted(
+            [(task.change_seq, task.id, task) for task in tasks] + 
+            [(row.change_seq, row.task_id, None) for row in deleted],
+            key=lambda change: change[:2]
+        )
+        has_more = len(changes) > limit
+        if has_more:
+            changes = changes[:limit]
+            sync_token = encode_cursor(seq=changes[-1][0], id=changes[-1][1])
+        else:
+            sync_token = encode_cursor(seq=last_seq)
+        return {
+            "tasks": task_serializer.many([task for _, _, task in changes if task is not None], fields), 
+            "deleted": [task_id for _, task_id, task in changes if task is None], 
+            "sync_token": sync_token,
+            "has_more": has_more
+        }
+    
+    def wants_stream(self) -> bool:
+        """
+        Stream the task list as NDJSON, with `?stream=1` or `Accept: application/x-ndjson`.
+        """
+        if request.args.get("stream") == "1":
+            return True
+        best = request.accept_mimetypes.best_match(["application/json", "application/x-ndjson"])
+        return best == "application/x-ndjson"
+    
+    def stream_task(self, query, sort: str = "id", fields: list[str] | None = None) -> Response:
+        """
+        Stream one task per line, rows are fetched `TASK_STREAM_BATCH_SIZE` 
+        at a time through a server side cursor, so memory doesn't grow with 
+        the number of tasks.
+        """
+        order = self.task_model.id.desc() if sort == "-id" else self.task_model.id
+        tasks = query.order_by(order).yield_per(int(settings.TASK_STREAM_BATCH_SIZE))
+        
+        def generate():
+            serialize = None
+            for task in tasks:
+                if serialize is None:
+                    serialize = task_serializer.compile(fields, getattr(task, "_fields", None))
+                yield current_app.json.dumps(serialize(task)) + "\n"
+        
+        return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+    
+    def count_task(self, query, model=None) -> int:
+        """
+        Count the tasks of the query without loading them.
+        """
+        model = model or self.task_model
+        return query.order_by(None).with_entities(func.count(model.id)).scalar()
+        
+    def task_to_dict(self, task, fields: list[str] | None = None) -> dict:
+        return task_serializer(task, fields)
+        
+    def build_response_data(
+        self, 
+        task: list[Task] | Task, 
+        total: int | None = None, 
+        next_cursor: str | None = None, 
+        fields: list[str] | None = None
+    ):
         data = {}
         
         if isinstance(task, list):
-            data.update({"tasks": [x.to_dict() for x in task], "total_task": len(task)})
+            data.update({
+                "tasks": task_serializer.many(task, fields), 
+                "total_task": len(task) if total is None else total,
+                "next_cursor": next_cursor
+            })
             return data
         
-        data.update({"task": task.to_dict() if task else "Task doesn't exists"})
+        data.update({"task": self.task_to_dict(task, fields) if task else "Task doesn't exists"})
         return data
     
+    def load_task_dicts(self, task_ids: list[int]) -> list[tuple[int, dict]]:
+        rows = db_session.execute(
+            select(*[getattr(self.task_model, f) for f in task_serializer.fields], self.task_model.change_seq)
+            .where(self.task_model.id.in_(task_ids))
+        ).all()
+        return [(row.change_seq, data) for row, data in zip(rows, task_serializer.many(rows))]
+    
+    def build_task_page(self, tasks: list, total: int, next_cursor: str | None) -> bytes:
+        """
+        JSON task list page (the `build_response_data` layout) assembled from 
+        the cached task fragments, `tasks` only needs `id` and `change_seq`, 
+        only the tasks missing from the cache are loaded and encoded.
+        """
+        fragments = get_task_fragments(tasks, self.load_task_dicts)
+        dumps = current_app.json.dumps
+        return b'{"next_cursor":%s,"tasks":[%s],"total_task":%s}' % (
+            dumps(next_cursor).encode(), b",".join(fragments), dumps(total).encode()
+        )
+    
     def create_manager_task(self, task: TaskCreateSerializer):
         """
         This function only create task, it `doesn't` save it.
@@ -96,6 +467,24 @@ class TaskMixin:
         )
         return task
     
+    def validate_task_create(self, data) -> tuple[TaskCreateSerializer | None, str | None]:
+        """
+        Returns the create serializer of `data`, or the validation error message.
+        """
+        try:
+            serializer = TaskCreateSerializer(**data)
+        except (AttributeError, TypeError):
+            return None, "Required fields: 'description' and 'body' for creating task"
+        
+        for field in ("description", "body"):
+            value = getattr(serializer, field)
+            if not isinstance(value, str):
+                return None, f"'{field}' must be a string"
+            max_length = getattr(self.task_model, field).type.length
+            if len(value) > max_length:
+                return None, f"'{field}' must be at most {max_length} characters"
+        return serializer, None
+    
     def get_task_status(self, status: str):
         if TaskStatus.Completed.value == status:
             return TaskStatus.Completed
@@ -109,17 +498,234 @@ class TaskMixin:
             return TaskStatus.NotStarted
         return None
     
-    def get_update_serializer(self):
-        if self.current_user.role == UserType.Manager or self.current_user.role == UserType.TeamLead:
-            return TUMSerializer
-        return TUESerializer
+    def get_employee_task_status(self, status: str):
+        """
+        Status an employee can set, returns the status and the error response.
+        
+        Employee can't set 'pending-review' or 'done', 'completed' is sent for review.
+        """
+        status = self.get_task_status(status)
+        if not status:
+            return None, (jsonify(message="Invalid status"), 400)
+        if status == TaskStatus.PendingReview or status == TaskStatus.Done:
+            return None, (jsonify(message="Access denied"), 403)
+        if status == TaskStatus.Completed:
+            return TaskStatus.PendingReview, None
+        return status, None
+    
+    def get_task_update_values(self, serializer):
+        """
+        Column values of a task update, returns the values and the error response.
+        
+        Employee can only update the status, manager and team lead the 
+        fields sent.
+        """
+        if self.current_user_role == UserType.Employee:
+            status, error = self.get_employee_task_status(serializer.status)
+            return {"status": status}, error
+        
+        values = {}
+        for k in serializer.__class__.__dict__.get("__match_args__"):
+            value = getattr(serializer, k)
+            if value is None:
+                continue
+            if k == "status": 
+                value = self.get_task_status(value)
+                if not value: return None, (jsonify(message="Invalid status"), 400)
+            if value:
+                values[k] = value
+        return values, None
+    
+    def get_if_match_version(self) -> int | None:
+        """
+        Task version of the `If-Match` header, None when missing or `*`.
+        
+        Accepts the task ETag (`<version>.<hash>`) or the bare `version`.
+        """
+        if not request.if_match or request.if_match.star_tag:
+            return None
+        versions = request.if_match.as_set()
+        if len(versions) != 1:
+            raise ValueError("If-Match must be one task version")
+        return int(versions.pop().partition(".")[0])
+    
+    def get_task_version_state(self, task_id: int) -> dict | None:
+        """
+        Current task state and version.
+        """
+        task = db_session.execute(
+            select(*[getattr(self.task_model, f) for f in TASK_STATE_FIELDS], self.task_model.version)
+            .where(self.task_model.id == task_id)
+        ).one_or_none()
+        return task._asdict() if task else None
     
+    def can_access_task(self, state: dict, action: str = "view") -> bool:
+        """
+        Policy of `get_task_scope`, for a task already read.
+        """
+        return task_allowed(self.current_user, self.current_user_role, action, state)
+    
+    def get_task_update_error(self, state: dict | None, version: int | None):
+        """
+        Error response of updating the task of `state` at `version`, None 
+        when it can be updated.
+        """
+        if not state:
+            return jsonify(message="Task not found"), 404
+        if not self.can_access_task(state, "update"):
+            return jsonify(message="You don't have permission to update task"), 403
+        if version is not None and state["version"] != version:
+            return jsonify(message="Task was modified", version=state["version"]), 412
+        return None
+    
+    def update_task(self, task_id: int, version: int, values: dict) -> bool:
+        """
+        Update the task if it's still at `version` and the current user can 
+        access it, in one UPDATE, the version is incremented.
+        """
+        result = db_session.execute(
+            update(self.task_model)
+            .where(
+                self.task_model.id == task_id, 
+                self.task_model.version == version, 
+                self.get_task_scope(action="update")
+            )
+            .values(**values, version=self.task_model.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+    
+    def delete_task(self, task_id: int, version: int) -> bool:
+        """
+        Delete the task if it's still at `version` and the current user can
+        delete it, in one DELETE.
+        """
+        result = db_session.execute(
+            delete(self.task_model)
+            .where(
+                self.task_model.id == task_id, 
+                self.task_model.version == version, 
+                self.get_task_scope(action="delete")
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+    
+    def insert_tasks(self, values: list[dict]) -> list:
+        """
+        Insert tasks in one multi-row INSERT, returns the inserted tasks as 
+        rows, in the order of `values`.
+        
+        MySQL has no INSERT .. RETURNING, the tasks are stamped with a change 
+        sequence number of their own (the counter stays locked until commit)
+        and read back by it with one SELECT, ids are given in row order.
+        """
+        seq = next_task_change_seq()
+        db_session.execute(insert(self.task_model).values([{**v, "change_seq": seq} for v in values]))
+        return db_session.execute(
+            select(*[getattr(self.task_model, f) for f in task_serializer.fields])
+            .where(self.task_model.change_seq == seq)
+            .order_by(self.task_model.id)
+        ).all()
+    
+    def get_bulk_task_ids(self, ids) -> list[int]:
+        if (
+            not isinstance(ids, list) or not ids or 
+            not all(isinstance(x, int) and not isinstance(x, bool) for x in ids)
+        ):
+            raise ValueError("'ids' must be a list of task ids")
+        if len(ids) > int(settings.TASK_BULK_MAX):
+            raise ValueError(f"At most {settings.TASK_BULK_MAX} tasks can be updated at once")
+        return list(dict.fromkeys(ids))
+    
+    def bulk_update_task(self, action: str, task_ids: list[int], values: dict, *where) -> list[int]:
+        """
+        Update the tasks of `task_ids` the current user can do `action` 
+        (update or assign) on, in one UPDATE statement, returns the updated 
+        task ids.
+        
+        MySQL has no UPDATE .. RETURNING, the matching rows are locked and 
+        read first in the same transaction, which also gives the state 
+        before the update for the change records. The `where` conditions 
+        are checked again by the UPDATE, they can be on other rows than the 
+        locked tasks (the assignee), nothing is updated when one changed.
+        """
+        scope = [self.task_model.id.in_(task_ids), self.get_task_scope(action=action), *where]
+        tasks = db_session.execute(
+            select(*[getattr(self.task_model, f) for f in TASK_STATE_FIELDS])
+            .where(*scope)
+            .with_for_update()
+        ).all()
+        updated_ids = [task.id for task in tasks]
+        if updated_ids:
+            result = db_session.execute(
+                update(self.task_model)
+                .where(self.task_model.id.in_(updated_ids), *where)
+                .values(**values, version=self.task_model.version + 1)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != len(updated_ids):
+                db_session.rollback()
+                return []
+        for task in tasks:
+            before = task_state(task)
+            record_task_change(action, before, {**before, **values})
+        return updated_ids
     
-    def check_task_created_by_team_lead(self, user_id):
+    def get_assign_conditions(self, user_id: int) -> list:
         """
-        This function receives the user_id from subject task.
+        Conditions of assigning a task to the user, besides the role scope:
+        the task is unassigned and the user active (an employee for team 
+        leads), checked in the UPDATE itself.
         """
-        return True if self.db_session.query(User).filter_by(id=user_id).one().role == UserType.TeamLead else False
+        assignee = select(self.user_model.id).where(
+            self.user_model.id == user_id, 
+            self.user_model.active.is_(True)
+        )
+        if self.current_user_role == UserType.TeamLead:
+            assignee = assignee.where(self.user_model.role == UserType.Employee)
+        return [
+            self.task_model.assigned_by_id.is_(None),
+            self.task_model.assigned_to_id.is_(None),
+            assignee.exists()
+        ]
+    
+    def assign_task(self, task_id: int, user_id: int) -> bool:
+        """
+        Assign an unassigned task the current user can access to an active 
+        user (team leads only to employees), in one conditional UPDATE.
+        
+        Concurrent assignments of the same task can't both succeed, the 
+        first one to update the row wins and the others update no row.
+        """
+        result = db_session.execute(
+            update(self.task_model)
+            .where(
+                self.task_model.id == task_id,
+                self.get_task_scope(action="assign"),
+                *self.get_assign_conditions(user_id)
+            )
+            .values(
+                assigned_by_id=self.current_user.id, 
+                assigned_to_id=user_id, 
+                version=self.task_model.version + 1
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            return False
+        
+        after = task_state(db_session.execute(
+            select(*[getattr(self.task_model, f) for f in TASK_STATE_FIELDS])
+            .where(self.task_model.id == task_id)
+        ).one())
+        record_task_change("assign", {**after, "assigned_by_id": None, "assigned_to_id": None}, after)
+        return True
+    
+    def get_update_serializer(self):
+        if self.current_user.role == UserType.Manager or self.current_user.role == UserType.TeamLead:
+            return TUMSerializer
+        return TUESerializer
 
 class TaskGet(MethodView, TaskMixin):
 
@@ -131,15 +737,98 @@ class TaskGet(MethodView, TaskMixin):
     @jwt_required()
     def get(self):
         """
-        Get all tasks
+        Get all tasks, a page at a time.
+        
+        Query parameters: `limit` and `cursor` (from `next_cursor` of the previous page),
+        `status`, `assigned_to`, `created_by`, `assigned_by` filters and `sort` (`id` or `-id`).
+        
+        With `stream=1` or `Accept: application/x-ndjson` all the tasks are streamed
+        as NDJSON instead, `limit` and `cursor` are ignored.
+        
+        With `since` (`0`, or the `sync_token` of the previous sync) only the
+        tasks changed since then are returned, with the ids of the `deleted` ones,
+        `limit` changes at a time (`has_more`).
+        
+        With `archived=1` the archived tasks are returned instead, a page at a time.
+        
+        `fields` selects the task columns to return, e.g. `fields=id,description,status`.
+        
+        Responds 304 Not Modified, without querying tasks, when `If-None-Match` 
+        has the ETag of the current version of the user task list.
+        Pages are cached per role scope until a task of the scope changes.
         """
         
-        self.set_current_user()
+        scope = self.get_task_list_scope()
+        version = get_task_list_version(scope)
+        etag = self.get_task_list_etag(scope, version)
+        if request.if_none_match.contains(etag):
+            return self.not_modified(etag)
         
-        tasks: list[Task] = self.get_task()
-        data = self.build_response_data(tasks)
+        cache_key = None
+        if not self.wants_stream():
+            cache_key = task_list_cache_key(scope, version, request.args)
+            body = get_task_list_response(cache_key)
+            if body is not None:
+                response = current_app.response_class(body, mimetype="application/json")
+                response.set_etag(etag)
+                response.headers["X-Cache"] = "HIT"
+                return response, 200
         
-        return  jsonify(data), 200
+        try:
+            filters = self.get_task_filters(request.args)
+            sort = self.get_task_sort(request.args)
+            since = decode_sync_token(request.args.get("since"))
+            archived = request.args.get("archived") == "1"
+            fields = self.get_task_fields(request.args, task_archive_serializer if archived else task_serializer)
+            
+            if archived:
+                query = self.get_archived_task(filters=filters, fields=fields)
+                limit = get_page_size(request.args.get("limit"))
+                cursor = decode_cursor(request.args.get("cursor"))
+                tasks, next_cursor = self.paginate_task(query, limit, cursor, sort, TaskArchive)
+                data = {
+                    "tasks": task_archive_serializer.many(tasks, fields),
+                    "total_task": self.count_task(query, TaskArchive),
+                    "next_cursor": next_cursor
+                }
+            
+            elif since is not None:
+                if filters:
+                    raise InvalidPageRequest("Filters can't be used with since")
+                # the change sequence number positions the sync token
+                query = self.get_task(fields=[*(fields or task_serializer.fields), "change_seq"])
+                limit = get_page_size(request.args.get("limit"))
+                data = self.sync_task(query, since, limit, fields)
+            
+            elif self.wants_stream():
+                # rows, not entities, are enough for serializing a list
+                query = self.get_task(filters=filters, fields=fields or task_serializer.fields)
+                response = self.stream_task(query, sort, fields)
+                response.set_etag(etag)
+                return response
+            
+            else:
+                # whole tasks come from the fragment cache, only their change sequence numbers are queried
+                query = self.get_task(filters=filters, fields=fields or ["change_seq"])
+                limit = get_page_size(request.args.get("limit"))
+                cursor = decode_cursor(request.args.get("cursor"))
+                tasks, next_cursor = self.paginate_task(query, limit, cursor, sort)
+        except (InvalidPageRequest, InvalidFields) as e:
+            return jsonify(message=str(e)), 400
+        
+        if archived or since is not None:
+            response = jsonify(data)
+        elif fields:
+            data = self.build_response_data(tasks, self.count_task(query), next_cursor, fields)
+            response = jsonify(data)
+        else:
+            body = self.build_task_page(tasks, self.count_task(query), next_cursor)
+            response = current_app.response_class(body, mimetype="application/json")
+        if cache_key:
+            set_task_list_response(cache_key, response.get_data())
+        response.set_etag(etag)
+        response.headers["X-Cache"] = "MISS"
+        return response, 200
 
     @jwt_required()
     def post(self):
@@ -147,19 +836,19 @@ class TaskGet(MethodView, TaskMixin):
         Create a task.
         """
         
-        self.set_current_user()
-        
         try:
-            task_serializer = TaskCreateSerializer(**request.json)
+            serializer = TaskCreateSerializer(**request.json)
         except Exception as e:
             return jsonify(message="Required fields: 'description' and 'body' for creating task"), 400
         
         # create team lead task
         if self.current_user.role == UserType.TeamLead:
             # create task
-            task = self.create_team_lead_task(task_serializer)
+            task = self.create_team_lead_task(serializer)
             db_session.add(task)
-            db_session.commit()
+            db_session.flush()
+            record_task_change("create", after=task_state(task))
+            commit_task_changes()
             
             data = self.build_response_data(task)
             
@@ -168,9 +857,11 @@ class TaskGet(MethodView, TaskMixin):
         # create manager task
         if self.current_user.role == UserType.Manager:
             # create task
-            task = self.create_manager_task(task_serializer)
+            task = self.create_manager_task(serializer)
             db_session.add(task)
-            db_session.commit()
+            db_session.flush()
+            record_task_change("create", after=task_state(task))
+            commit_task_changes()
             
             data = self.build_response_data(task)
             
@@ -179,6 +870,255 @@ class TaskGet(MethodView, TaskMixin):
         return jsonify(message="Access denied"), 403
 
 
+class TaskBulk(MethodView, TaskMixin):
+    
+    def __init__(self, task: Task):
+        self.task_model: Task = task
+    
+    @jwt_required()
+    def post(self):
+        """
+        Create many tasks at once, request body is a list of task payloads.
+        
+        All the tasks are validated first, nothing is created if any of them is 
+        invalid. Tasks are inserted with one INSERT statement and read back 
+        with one SELECT, in one transaction.
+        """
+        
+        if not self.can("create"):
+            return jsonify(message="Access denied"), 403
+        
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, list) or not payload:
+            return jsonify(message="Request body must be a list of tasks"), 400
+        if len(payload) > int(settings.TASK_BULK_MAX):
+            return jsonify(message=f"At most {settings.TASK_BULK_MAX} tasks can be created at once"), 400
+        
+        serializers, errors = [], []
+        for index, data in enumerate(payload):
+            serializer, error = self.validate_task_create(data if isinstance(data, dict) else {})
+            if error:
+                errors.append({"index": index, "message": error})
+            serializers.append(serializer)
+        
+        if errors:
+            return jsonify(message="No task created, invalid tasks", errors=errors), 400
+        
+        tasks = self.insert_tasks([
+            {"description": s.description, "body": s.body, "created_by_id": self.current_user.id} 
+            for s in serializers
+        ])
+        for task in tasks:
+            record_task_change("create", after=task_state(task))
+        results = [
+            {"index": index, "task": task} for index, task in enumerate(task_serializer.many(tasks))
+        ]
+        commit_task_changes()
+        
+        return jsonify(message=f"{len(tasks)} tasks created", results=results, total_task=len(tasks)), 201
+    
+    @jwt_required()
+    def patch(self):
+        """
+        Update the status of many tasks at once, request body `{"ids": [...], "status": "..."}`.
+        
+        Same rules as updating the status of one task, tasks the user can't 
+        access are not updated and returned in `not_updated`.
+        """
+        
+        try:
+            serializer = TaskBulkStatusSerializer(**request.json)
+            task_ids = self.get_bulk_task_ids(serializer.ids)
+        except (AttributeError, TypeError) as e:
+            return jsonify(message="Required fields: 'ids' and 'status'"), 400
+        except ValueError as e:
+            return jsonify(message=str(e)), 400
+        
+        if self.current_user_role == UserType.Employee:
+            status, error = self.get_employee_task_status(serializer.status)
+            if error:
+                return error
+        else:
+            status = self.get_task_status(serializer.status)
+            if not status:
+                return jsonify(message="Invalid status"), 400
+        
+        updated_ids = self.bulk_update_task("update", task_ids, {"status": status})
+        commit_task_changes()
+        
+        return jsonify(
+            message="Task status updated",
+            updated=updated_ids,
+            not_updated=sorted(set(task_ids) - set(updated_ids))
+        ), 202
+
+
+class TaskBulkAssign(MethodView, TaskMixin, UserVerifyMixin):
+    
+    def __init__(self, user_model: User, task_model: Task):
+        self.user_model = user_model
+        self.task_model = task_model
+        self.db_session = db_session
+    
+    @jwt_required()
+    def patch(self, user_id: str):
+        """
+        Assign many tasks to the user, request body `{"ids": [...]}`.
+        
+        Same rules as assigning one task (the same UPDATE conditions), tasks 
+        already assigned or the user can't access are not assigned and 
+        returned in `not_assigned`. The user is only read to explain why 
+        nothing was assigned.
+        """
+        
+        if not self.can("assign"):
+            return jsonify(message="Access denied"), 403
+        
+        try:
+            user_id = int(user_id)
+            serializer = TaskBulkAssignSerializer(**request.json)
+            task_ids = self.get_bulk_task_ids(serializer.ids)
+        except (AttributeError, TypeError) as e:
+            return jsonify(message="Required fields: 'ids'"), 400
+        except ValueError as e:
+            return jsonify(message=str(e)), 400
+        
+        assigned_ids = self.bulk_update_task(
+            "assign",
+            task_ids, 
+            {"assigned_by_id": self.current_user.id, "assigned_to_id": user_id},
+            *self.get_assign_conditions(user_id)
+        )
+        if not assigned_ids:
+            db_session.rollback()
+            
+            # check user existence before assign tasks
+            # and user should be active
+            if not self.check_user_by_id(user_id):
+                return jsonify(message="User doesnot exists"), 400
+            
+            # team lead can assign to Employee
+            if self.current_user_role == UserType.TeamLead and self.checked_user.role != UserType.Employee:
+                return jsonify(message=f"Invalid request: Team lead can only assign task to employee"), 400
+        
+        commit_task_changes()
+        
+        return jsonify(
+            message=f"Tasks assigned to user {user_id}",
+            assigned=assigned_ids,
+            not_assigned=sorted(set(task_ids) - set(assigned_ids))
+        ), 202
+
+
+class TaskStats(MethodView, TaskMixin):
+    
+    def __init__(self, task: Task):
+        self.task_model: Task = task
+    
+    @jwt_required()
+    def get(self):
+        """
+        Task counts per status, per assignee and per creator (manager only),
+        and the task list cache hits and misses.
+        """
+        
+        if self.current_user_role != UserType.Manager:
+            return jsonify(message="Access denied"), 403
+        
+        data = get_task_stats()
+        data["list_cache"] = get_task_list_cache_stats()
+        return jsonify(data), 200
+
+
+class TaskEvents(MethodView, TaskMixin):
+    
+    def __init__(self, task: Task):
+        self.task_model: Task = task
+    
+    def can_see_event(self, event: TaskEvent) -> bool:
+        return any(state and self.can_access_task(state) for state in (event.before, event.after))
+    
+    def format_event(self, event: TaskEvent) -> str:
+        task = None
+        if event.after and self.can_access_task(event.after):
+            task = serialize_task_state(event.after)
+        data = current_app.json.dumps({"action": event.action, "task_id": event.task_id, "task": task})
+        return f"id: {event.id}\nevent: {event.action}\ndata: {data}\n\n"
+    
+    @jwt_required()
+    def get(self):
+        """
+        Server-Sent Events of the changes of the tasks the user can access.
+        
+        Events are `create`, `update`, `assign` and `delete` with the task 
+        (null when deleted or no longer accessible). With `Last-Event-ID` the 
+        feed resumes after that event, a `reset` event means events were 
+        missed and the task list should be fetched again.
+        """
+        
+        try:
+            event_id = int(request.headers.get("Last-Event-ID", broker.last_id))
+        except ValueError as e:
+            return jsonify(message="Invalid Last-Event-ID"), 400
+        
+        heartbeat = float(settings.TASK_EVENTS_HEARTBEAT)
+        # the feed doesn't query, don't hold a database connection while streaming
+        db_session.close()
+        
+        def generate():
+            nonlocal event_id
+            while True:
+                events, complete, next_id = broker.wait(event_id, heartbeat)
+                if not complete:
+                    yield f"id: {next_id}\nevent: reset\ndata: {{}}\n\n"
+                events = [e for e in events if self.can_see_event(e)]
+                for event in events:
+                    yield self.format_event(event)
+                if not events:
+                    yield ": keep-alive\n\n"
+                event_id = next_id
+        
+        return Response(
+            stream_with_context(generate()), 
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+
+class TaskSearch(MethodView, TaskMixin):
+    
+    def __init__(self, task: Task):
+        self.task_model: Task = task
+    
+    @jwt_required()
+    def get(self):
+        """
+        Search tasks by words in description and body.
+        
+        Query parameters: `q`, and the paging, filter, sort and fields parameters of task list.
+        """
+        
+        q = request.args.get("q", "").strip()
+        if not q:
+            return jsonify(message="Search query 'q' is required"), 400
+        
+        try:
+            limit = get_page_size(request.args.get("limit"))
+            cursor = decode_cursor(request.args.get("cursor"))
+            filters = self.get_task_filters(request.args)
+            sort = self.get_task_sort(request.args)
+            fields = self.get_task_fields(request.args)
+            
+            query = self.get_task(filters=filters, fields=fields or task_serializer.fields).filter(search_clause(self.task_model, q))
+            tasks, next_cursor = self.paginate_task(query, limit, cursor, sort)
+        except (InvalidPageRequest, InvalidFields) as e:
+            return jsonify(message=str(e)), 400
+        
+        data = self.build_response_data(tasks, self.count_task(query), next_cursor, fields)
+        
+        return jsonify(data), 200
+
+
 class TaskDetail(MethodView, TaskMixin):
     
     def __init__(self, task: Task):
@@ -187,10 +1127,25 @@ class TaskDetail(MethodView, TaskMixin):
         
     @jwt_required()
     def get(self, task_id: str):
-        self.set_current_user()
+        try:
+            fields = self.get_task_fields(request.args)
+        except InvalidFields as e:
+            return jsonify(message=str(e)), 400
         
         try:
-            task: Task = self.get_task(task_id=int(task_id))
+            task_id = int(task_id)
+        except Exception as e:
+            return jsonify(message="Invalid task ID"), 400
+        
+        # read before the task, a write in between changes it
+        etag_version = get_task_version(task_id)
+        if etag_version:
+            etag = self.get_not_modified_etag(self.get_task_etag_hash(task_id, etag_version))
+            if etag:
+                return self.not_modified(etag)
+        
+        try:
+            task: Task = self.get_task(task_id=task_id, fields=fields)
         except Exception as e:
             return jsonify(message="Invalid task ID"), 400  
         
@@ -201,28 +1156,46 @@ class TaskDetail(MethodView, TaskMixin):
             # with existence 
             if self.task_exists:
                 return jsonify(message="You don't have permission to view task details"), 403
-        
+            
+            # archived task
+            task = self.get_archived_task(task_id=task_id, fields=fields)
+            if task and not self.can_access_task(task._asdict()):
+                return jsonify(message="You don't have permission to view task details"), 403
+            
             # with no existence
-            if not self.task_exists:
+            if not task:
                 return jsonify(message="Task not found"), 404
+            
+            data = {"task": task_archive_serializer(task, fields)}
+        else:
+            data = self.build_response_data(task, fields=fields)
         
-        data = self.build_response_data(task)
+        if etag_version is None:
+            # only for a task the user can see, None when a write started one
+            # in between, the response has no ETag then
+            etag_version = start_task_version(task_id)
         
-        return  jsonify(message=data), 302
+        response = jsonify(message=data)
+        if etag_version:
+            response.set_etag(self.get_task_etag(task.version, self.get_task_etag_hash(task_id, etag_version)))
+        return response, 302
     
     
     @jwt_required()
     def put(self, task_id: str):
         """
         Update a task
+        
+        With `If-Match: "<version>"` (the task `version`) the task is only 
+        updated if it's still at that version, otherwise 412 Precondition Failed.
+        The update is one UPDATE conditional on the version read first, for 
+        the change record.
         """
         
         try:
-            task_id=int(task_id)
+            task_id = int(task_id)
         except Exception as e:
-            jsonify(message=str(e)), 400
-        
-        self.set_current_user()
+            return jsonify(message="Invalid task ID"), 400
         
         try:
             serializer = self.get_update_serializer()(**request.json)
@@ -231,89 +1204,59 @@ class TaskDetail(MethodView, TaskMixin):
                 return jsonify(message="Employee can update status only"), 400
             return jsonify(message="Accepted fields: status, description, or body"), 400
         
+        try:
+            version = self.get_if_match_version()
+        except ValueError as e:
+            return jsonify(message="If-Match must be the task version"), 400
         
-        task = self.get_task(task_id)
+        values, error = self.get_task_update_values(serializer)
+        if error: return error
         
-        # no task
-        if not task:
-            # with existence 
-            if self.task_exists:
-                return jsonify(message="You don't have permission to update task"), 403
+        before = self.get_task_version_state(task_id)
+        error = self.get_task_update_error(before, version)
+        if error: return error
         
-            # with no existence
-            if not self.task_exists:
-                return jsonify(message="Task not found"), 404
+        message = "Task status updated" if self.current_user_role == UserType.Employee else "Task updated successfully"
         
-        if self.current_user.role == UserType.Employee:
-            # Employee can only update status of the task
-            
-            status = self.get_task_status(serializer.status)
-            
-            if not status: return jsonify(message="Invalid status"), 400
-            
-            if status == TaskStatus.PendingReview or status == TaskStatus.Done:
-                return jsonify(message="Access denied"), 403
-            
-            if status == TaskStatus.Completed:
-                task.status = TaskStatus.PendingReview
-                self.db_session.add(task)
-                self.db_session.commit()
-                return jsonify(message="Task status updated"), 202
-            
-            task.status = status
-            self.db_session.add(task)
-            self.db_session.commit()
-            return jsonify(message="Task status updated"), 202
+        if not values:
+            return jsonify(message=message, version=before["version"]), 202
         
-        if self.current_user.role == UserType.TeamLead:
-            for k in serializer.__class__.__dict__.get("__match_args__"):
-                value = getattr(serializer, k)
-                if k == "status": 
-                    value = self.get_task_status(value)
-                    if not value: return jsonify(message="Invalid status"), 400
-                if value:
-                    setattr(task, k, value)
-                    
-            self.db_session.add(task)
-            self.db_session.commit()
-            
-            return jsonify(message="Task updated successfully"), 202
+        if not self.update_task(task_id, before["version"], values):
+            db_session.rollback()
+            # the task changed since `before`, why it wasn't updated
+            error = self.get_task_update_error(self.get_task_version_state(task_id), version)
+            return error or (jsonify(message="Task was modified concurrently, retry the update"), 409)
         
+        before_state = {f: before[f] for f in TASK_STATE_FIELDS}
+        record_task_change("update", before_state, {**before_state, **values})
+        commit_task_changes()
         
-        if self.current_user.role == UserType.Manager:
-            for k in serializer.__class__.__dict__.get("__match_args__"):
-                value = getattr(serializer, k)
-                if k == "status": 
-                    value = self.get_task_status(value)
-                    if not value: return jsonify(message="Invalid status"), 400
-                if value:
-                    setattr(task, k, value)
-                    
-            self.db_session.add(task)
-            self.db_session.commit()
-            
-            return jsonify(message="Task updated successfully"), 202
-        
-        return jsonify(message="Unhandled request"), 500
+        return jsonify(message=message, version=before["version"] + 1), 202
     
     @jwt_required()
     def delete(self, task_id: str):
         """
         Delete a task.
-        """
         
-        self.set_current_user()
+        With `If-Match` (the task ETag or `version`) the task is only deleted
+        if it's still at that version, otherwise 412 Precondition Failed.
+        """
         
-        if self.current_user_role == UserType.Employee:
+        if not self.can("delete"):
             return jsonify(message="Access denied"), 403
         
         try:
             task_id: int = int(task_id)
         except Exception as e:
             return jsonify(message="Invalid task id"), 400
+        
+        try:
+            version = self.get_if_match_version()
+        except ValueError as e:
+            return jsonify(message="If-Match must be the task version"), 400
 
         # delete task
-        task: Task = self.get_task(task_id)
+        task = self.get_task(task_id, fields=[*TASK_STATE_FIELDS, "version", "change_seq"], action="delete")
         
         # no task
         if not task:
@@ -322,24 +1265,80 @@ class TaskDetail(MethodView, TaskMixin):
                 return jsonify(message="You don't have permission to delete"), 403
         
             # with no existence
-            if not self.task_exists:
-                return jsonify(message="Task not found"), 404
+            return jsonify(message="Task not found"), 404
         
-        if self.current_user_role == UserType.Manager:    
-            task_data = {"task_id": task_id, "description": task.description}
-            self.db_session.delete(task)
-            self.db_session.commit()
-            return jsonify(message="Task ({task_id}:{description}) delete successfully".format(**task_data)), 204
-                
-        if self.current_user_role == UserType.TeamLead:
-            if task.created_by_id == self.current_user.id:
-                task_data = {"task_id": task_id, "description": task.description}
-                self.db_session.delete(task)
-                self.db_session.commit()
-                return jsonify(message="Task ({task_id}:{description}) delete successfully".format(**task_data)), 204
-            return jsonify(message="Access denied: Unauthorized request"), 403
+        if version is not None and task.version != version:
+            return jsonify(message="Task was modified", version=task.version), 412
+        
+        # the change record needs the deleted state, not a newer one
+        if not self.delete_task(task_id, task.version):
+            db_session.rollback()
+            return jsonify(message="Task was modified concurrently, retry the delete"), 409
+        
+        task_data = {"task_id": task_id, "description": task.description}
+        record_task_change("delete", before=task_state(task), change_seq=task.change_seq)
+        commit_task_changes()
+        return jsonify(message="Task ({task_id}:{description}) delete successfully".format(**task_data)), 204
+
+class TaskHistoryView(MethodView, TaskMixin):
+    
+    def __init__(self, task: Task):
+        self.task_model: Task = task
+    
+    def check_task_history_access(self, task_id: int):
+        """
+        Error response when the user can't see the task history, None otherwise.
+        
+        History of archived tasks follows the task rules, of deleted tasks
+        is for managers only.
+        """
+        if self.get_task(task_id=task_id, fields=["id"]):
+            return None
+        if self.task_exists:
+            return jsonify(message="You don't have permission to view task details"), 403
+        
+        task = self.get_archived_task(task_id=task_id, fields=["id"])
+        if task:
+            if self.can_access_task(task._asdict()):
+                return None
+            return jsonify(message="You don't have permission to view task details"), 403
         
-        return jsonify(message="Unhandled request"), 500
+        if self.current_user_role != UserType.Manager:
+            return jsonify(message="Task not found"), 404
+        return None
+    
+    @jwt_required()
+    def get(self, task_id: str):
+        """
+        Changes of a task, oldest first, a page at a time (`limit` and `cursor`).
+        """
+        
+        try:
+            task_id = int(task_id)
+        except Exception as e:
+            return jsonify(message="Invalid task ID"), 400
+        
+        error = self.check_task_history_access(task_id)
+        if error: return error
+        
+        try:
+            limit = get_page_size(request.args.get("limit"))
+            cursor = decode_cursor(request.args.get("cursor"))
+        except InvalidPageRequest as e:
+            return jsonify(message=str(e)), 400
+        
+        query = db_session.query(TaskHistory).filter(TaskHistory.task_id == task_id)
+        if cursor:
+            query = query.filter(TaskHistory.id > cursor["id"])
+        history = query.order_by(TaskHistory.id).limit(limit + 1).all()
+        
+        next_cursor = None
+        if len(history) > limit:
+            history = history[:limit]
+            next_cursor = encode_cursor(id=history[-1].id)
+        
+        return jsonify(history=task_history_serializer.many(history), next_cursor=next_cursor), 200
+
 
 class TaskAssign(MethodView, TaskMixin, UserVerifyMixin):
     
@@ -352,11 +1351,12 @@ class TaskAssign(MethodView, TaskMixin, UserVerifyMixin):
     def get(self, task_id: str, user_id: str):
         """
         Assign task.
-        """
         
-        self.set_current_user()
+        The task is assigned by one conditional UPDATE, the task and the user
+        are only read to explain why nothing was assigned.
+        """
         
-        if self.current_user.role == UserType.Employee:
+        if not self.can("assign"):
             return jsonify(message="Access denied"), 403
         
         try:
@@ -364,12 +1364,23 @@ class TaskAssign(MethodView, TaskMixin, UserVerifyMixin):
         except Exception as e:
             return jsonify(message=str(e)), 400
         
+        if self.assign_task(task_id, user_id):
+            commit_task_changes()
+            if self.current_user.role == UserType.Manager:
+                return jsonify(message=f"Manager -> Assigns ask {task_id} assigned to Team lead {user_id}"), 202
+            return jsonify(message=f"Task {task_id} assigned to Employee {user_id}"), 200
+        db_session.rollback()
+        
         # check employee existence before assign a task
         # and employee should be active
         if not self.check_user_by_id(int(user_id)):
             return jsonify(message="User doesnot exists"), 400
+        
+        # team lead can assign to Employee
+        if self.current_user.role == UserType.TeamLead and self.checked_user.role != UserType.Employee:
+            return jsonify(message=f"Invalid request: Team lead can only assign task to employee"), 400
 
-        task: Task = self.get_task(task_id)
+        task = self.get_task(task_id, fields=["id"], action="assign")
         
         # no task
         if not task:
@@ -381,31 +1392,62 @@ class TaskAssign(MethodView, TaskMixin, UserVerifyMixin):
             if not self.task_exists:
                 return jsonify(message="Task not found"), 404
         
-        if isinstance(task.assigned_by_id, int):
-            return jsonify(message='Task already assigned'), 400
-        
-        if self.current_user.role == UserType.Manager:
-            # manager can assign to team lead and employee
-            task.assigned_by_id = self.current_user.id
-            task.assigned_to_id = self.checked_user.id
-            self.db_session.add(task)
-            self.db_session.commit()
-            return jsonify(message=f"Manager -> Assigns ask {task_id} assigned to Team lead {user_id}"), 202
-        
-        if self.current_user.role == UserType.TeamLead:
-            # team lead can assign to Employee
-            if self.checked_user.role == UserType.Employee:
-                task.assigned_by_id = self.current_user.id
-                task.assigned_to_id = self.checked_user.id
-                self.db_session.add(task)
-                self.db_session.commit()
-                return jsonify(message=f"Task {task_id} assigned to Employee {user_id}"), 200
-            
-            return jsonify(message=f"Invalid request: Team lead can only assign task to employee"), 400
-        
-        return jsonify(message="Invalid request: request flow out of bound"), 500
+        return jsonify(message='Task already assigned'), 400
 
 
 bp.add_url_rule("", view_func=TaskGet.as_view("task-all", Task))
+bp.add_url_rule("/bulk", view_func=TaskBulk.as_view("task-bulk", Task))
+bp.add_url_rule("/bulk/assign/<user_id>", view_func=TaskBulkAssign.as_view("task-bulk-assign", User, Task))
+bp.add_url_rule("/stats", view_func=TaskStats.as_view("task-stats", Task))
+bp.add_url_rule("/search", view_func=TaskSearch.as_view("task-search", Task))
+bp.add_url_rule("/events", view_func=TaskEvents.as_view("task-events", Task))
 bp.add_url_rule("/<task_id>", view_func=TaskDetail.as_view("task-detail", Task))
-bp.add_url_rule("/<task_id>/assign/<user_id>", view_func=TaskAssign.as_view("task-assign", User, Task))
\ No newline at end of file
+bp.add_url_rule("/<task_id>/history", view_func=TaskHistoryView.as_view("task-history", Task))
+bp.add_url_rule("/<task_id>/assign/<user_id>", view_func=TaskAssign.as_view("task-assign", User, Task))
+
+
+@bp.cli.command("rebuild-search-index")
+def rebuild_search_index_command():
+    """
+    Rebuild the SQLite full text index of tasks.
+    """
+    rebuild_search_index()
+    print("Task search index rebuilt")
+
+
+
+@bp.cli.command("rebuild-stats")
+def rebuild_stats_command():
+    """
+    Recount the task statistics from the task table.
+    """
+    rebuild_task_stats()
+    print("Task statistics rebuilt")
+
+
+@bp.cli.command("dispatch-webhooks")
+@click.option("--once", is_flag=True, help="Stop when no change is ready to send.")
+def dispatch_webhooks_command(once):
+    """
+    Send the task changes of the outbox to the webhooks (`TASK_WEBHOOK_URLS`).
+    """
+    if not settings.TASK_WEBHOOK_SECRET:
+        raise click.UsageError("TASK_WEBHOOK_SECRET is required to sign webhook requests")
+    WebhookDispatcher(settings.TASK_WEBHOOK_SECRET).run(once=once)
+
+
+@bp.cli.command("archive-tasks")
+@click.option("--days", type=int, default=None, help="Archive tasks done for more days (TASK_ARCHIVE_AFTER_DAYS).")
+@click.option("--chunk-size", type=int, default=None, help="Tasks archived per transaction (TASK_ARCHIVE_CHUNK_SIZE).")
+@click.option("--every", type=int, default=None, help="Keep running, archive every given minutes.")
+def archive_tasks_command(days, chunk_size, every):
+    """
+    Move the tasks done for long from the task table to the archive.
+    """
+    days = int(settings.TASK_ARCHIVE_AFTER_DAYS) if days is None else days
+    chunk_size = chunk_size or int(settings.TASK_ARCHIVE_CHUNK_SIZE)
+    while True:
+        print(f"{archive_done_tasks(days, chunk_size)} tasks archived")
+        if not every:
+            return
+        time.sleep(every * 60)
@@ -0,0 +1,96 @@
+from datetime import datetime
+from enum import Enum
+from operator import attrgetter, itemgetter
+
+from sqlalchemy import DateTime, Enum as SQLEnum
+
+
+class RowSerializer:
+    """
+    Serialize model entities or column only query rows to dict.
+
+    The column list and the enum and datetime (ISO 8601) conversions are worked out once per
+    model (and once per requested set of fields and row layout), not on every row.
+    Query rows are read by position, entities by attribute.
+    """
+
+    def __init__(self, model, exclude: list[str] | None = None):
+        self.model = model
+        self.exclude = set(exclude or [])
+        self._fields = None
+        self._enum_fields = None
+        self._datetime_fields = None
+        self._compiled = {}
+
+    def _columns(self):
+        if self._fields is None:
+            columns = [c for c in self.model.__table__.columns if c.name not in self.exclude]
+            self._fields = tuple(c.name for c in columns)
+            self._enum_fields = frozenset(
+                c.name for c in columns
+                if isinstance(c.type, SQLEnum) and c.type.enum_class is not None
+            )
+            self._datetime_fields = frozenset(c.name for c in columns if isinstance(c.type, DateTime))
+        return self._fields, self._enum_fields
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        return self._columns()[0]
+
+    def compile(self, fields: tuple[str, ...] | None = None, layout: tuple[str, ...] | None = None):
+        """
+        Returns a function serializing `fields` (all the fields by default) of a row.
+
+        `layout` is the column names of query rows (`Row._fields`),
+        entities are serialized when it is None.
+        """
+        all_fields, enum_fields = self._columns()
+        if fields:
+            # in column order, so every permutation of a fieldset shares one serializer
+            requested = set(fields)
+            fields = tuple(f for f in all_fields if f in requested) + tuple(sorted(requested.difference(all_fields)))
+        else:
+            fields = all_fields
+
+        key = (fields, layout)
+        serialize = self._compiled.get(key)
+        if serialize:
+            return serialize
+
+        if layout is None:
+            getter = attrgetter(*fields)
+        else:
+            getter = itemgetter(*[layout.index(f) for f in fields])
+        if len(fields) == 1:
+            single = getter
+            getter = lambda row: (single(row),)
+
+        enums = tuple(f for f in fields if f in enum_fields)
+        datetimes = tuple(f for f in fields if f in self._datetime_fields)
+
+        def serialize(row) -> dict:
+            data = dict(zip(fields, getter(row)))
+            for f in enums:
+                value = data[f]
+                if isinstance(value, Enum):
+                    data[f] = value.value
+            for f in datetimes:
+                value = data[f]
+                if isinstance(value, datetime):
+                    data[f] = value.isoformat()
+            return data
+
+        self._compiled[key] = serialize
+        return serialize
+
+    def __call__(self, row, fields: list[str] | None = None) -> dict:
+        return self.compile(fields, getattr(row, "_fields", None))(row)
+
+    def many(self, rows: list, fields: list[str] | None = None) -> list[dict]:
+        """
+        Serialize rows of the same query.
+        """
+        if not rows:
+            return []
+        serialize = self.compile(fields, getattr(rows[0], "_fields", None))
+        return [serialize(row) for row in rows]
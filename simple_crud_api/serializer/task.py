@@ -16,4 +16,15 @@ class TUESerializer:
 class TUMSerializer:
     status: str | None = None
     description: str | None = None
-    body: str | None = None
\ No newline at end of file
+    body: str | None = None
+    
+# Bulk status update
+@dataclass
+class TaskBulkStatusSerializer:
+    ids: list[int]
+    status: str
+
+# Bulk assign
+@dataclass
+class TaskBulkAssignSerializer:
+    ids: list[int]
\ No newline at end of file
@@ -27,4 +27,40 @@ MAIL_DEFAULT_SENDER = os.environ.get("MAIL_USERNAME")
 
 CACHE_TYPE = os.environ.get('CACHE_TYPE')
 CACHE_DEFAULT_TIMEOUT = os.environ.get('CACHE_DEFAULT_TIMEOUT')
-CACHE_DIR = os.environ.get('CACHE_DIR')
\ No newline at end of file
+CACHE_DIR = os.environ.get('CACHE_DIR')
+
+# bcrypt threads, and hashes waiting for one before answering 503
+PASSWORD_HASH_WORKERS = os.environ.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 2)
+PASSWORD_HASH_QUEUE = os.environ.get('PASSWORD_HASH_QUEUE', 32)
+# bcrypt work factor of new hashes, or calibrated at startup to take about
+# PASSWORD_HASH_TARGET_MS with PASSWORD_HASH_CALIBRATE=1, once for all the
+# processes sharing the cache
+PASSWORD_HASH_ROUNDS = os.environ.get('PASSWORD_HASH_ROUNDS', 12)
+PASSWORD_HASH_MIN_ROUNDS = os.environ.get('PASSWORD_HASH_MIN_ROUNDS', 10)
+PASSWORD_HASH_TARGET_MS = os.environ.get('PASSWORD_HASH_TARGET_MS', 250)
+PASSWORD_HASH_CALIBRATE = os.environ.get('PASSWORD_HASH_CALIBRATE', '0')
+
+USER_IDENTITY_CACHE_SIZE = os.environ.get('USER_IDENTITY_CACHE_SIZE', 10000)
+USER_IDENTITY_CACHE_TTL = os.environ.get('USER_IDENTITY_CACHE_TTL', 60)
+TOKEN_REVOCATION_REFRESH_INTERVAL = os.environ.get('TOKEN_REVOCATION_REFRESH_INTERVAL', 30)
+
+TASK_PAGE_SIZE = os.environ.get('TASK_PAGE_SIZE', 50)
+TASK_PAGE_SIZE_MAX = os.environ.get('TASK_PAGE_SIZE_MAX', 500)
+TASK_STREAM_BATCH_SIZE = os.environ.get('TASK_STREAM_BATCH_SIZE', 500)
+TASK_BULK_MAX = os.environ.get('TASK_BULK_MAX', 500)
+TASK_LIST_CACHE_TIMEOUT = os.environ.get('TASK_LIST_CACHE_TIMEOUT', 300)
+TASK_FRAGMENT_CACHE_TIMEOUT = os.environ.get('TASK_FRAGMENT_CACHE_TIMEOUT', 3600)
+TASK_VERSION_CACHE_TIMEOUT = os.environ.get('TASK_VERSION_CACHE_TIMEOUT', 86400)
+TASK_EVENTS_BUFFER = os.environ.get('TASK_EVENTS_BUFFER', 1000)
+TASK_EVENTS_HEARTBEAT = os.environ.get('TASK_EVENTS_HEARTBEAT', 15)
+TASK_ARCHIVE_AFTER_DAYS = os.environ.get('TASK_ARCHIVE_AFTER_DAYS', 30)
+TASK_ARCHIVE_CHUNK_SIZE = os.environ.get('TASK_ARCHIVE_CHUNK_SIZE', 500)
+
+# comma separated webhook urls receiving task changes
+TASK_WEBHOOK_URLS = os.environ.get('TASK_WEBHOOK_URLS', '')
+TASK_WEBHOOK_SECRET = os.environ.get('TASK_WEBHOOK_SECRET')
+TASK_WEBHOOK_BATCH_SIZE = os.environ.get('TASK_WEBHOOK_BATCH_SIZE', 100)
+TASK_WEBHOOK_TIMEOUT = os.environ.get('TASK_WEBHOOK_TIMEOUT', 5)
+TASK_WEBHOOK_MAX_ATTEMPTS = os.environ.get('TASK_WEBHOOK_MAX_ATTEMPTS', 10)
+TASK_WEBHOOK_RETRY_DELAY = os.environ.get('TASK_WEBHOOK_RETRY_DELAY', 5)
+TASK_WEBHOOK_POLL_INTERVAL = os.environ.get('TASK_WEBHOOK_POLL_INTERVAL', 1)
@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+from sqlalchemy import delete, insert, select
+
+from ..database import db_session
+from ..models.task import Task, TaskStatus, utcnow
+from ..models.task_archive import TaskArchive
+from .changes import commit_task_changes, record_task_change, task_state
+
+
+def archive_done_tasks(days: int, chunk_size: int) -> int:
+    """
+    Move the tasks done (not changed) for more than `days` days to the
+    archive, `chunk_size` tasks per transaction, returns the number of 
+    archived tasks.
+    
+    Every chunk is committed, an interrupted run is resumed by running 
+    it again. Archived tasks are removed from the statistics, the search 
+    index and the synced lists like deleted tasks.
+    """
+    columns = [c.name for c in Task.__table__.columns]
+    archived = 0
+    while True:
+        cutoff = utcnow() - timedelta(days=days)
+        tasks = db_session.execute(
+            select(*[getattr(Task, c) for c in columns])
+            .where(
+                Task.status == TaskStatus.Done, 
+                Task.updated_at <= cutoff
+            )
+            .order_by(Task.id)
+            .limit(chunk_size)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not tasks:
+            return archived
+        
+        now = utcnow()
+        db_session.execute(insert(TaskArchive), [{**task._asdict(), "archived_at": now} for task in tasks])
+        db_session.execute(
+            delete(Task)
+            .where(Task.id.in_([task.id for task in tasks]))
+            .execution_options(synchronize_session=False)
+        )
+        for task in tasks:
+            record_task_change("archive", before=task_state(task), change_seq=task.change_seq)
+        commit_task_changes()
+        archived += len(tasks)
@@ -0,0 +1,90 @@
+from dataclasses import dataclass
+
+from flask import g
+from flask_jwt_extended import current_user
+
+from ..database import db_session
+from .events import publish_task_changes
+from .history import write_task_history
+from .response_cache import delete_task_fragments
+from .search import index_task_changes
+from .stats import apply_task_stats
+from .sync import apply_task_sync
+from .webhooks import enqueue_task_webhooks
+from .versions import bump_task_versions
+
+
+# task columns kept in a change record
+TASK_STATE_FIELDS = (
+    "id",
+    "description",
+    "body",
+    "status",
+    "created_by_id",
+    "assigned_by_id",
+    "assigned_to_id"
+)
+
+
+@dataclass
+class TaskChange:
+    # create, update, assign, delete or archive
+    action: str
+    task_id: int
+    # task state before and after the change, None before create and after delete
+    before: dict | None = None
+    after: dict | None = None
+    # user making the change, None outside of requests (commands)
+    user_id: int | None = None
+    # change sequence number of the task before the change, keys its cached JSON
+    change_seq: int | None = None
+
+
+def task_state(task) -> dict:
+    """
+    State of a task entity or query row, for change records.
+    """
+    return {f: getattr(task, f) for f in TASK_STATE_FIELDS}
+
+
+def get_change_user_id() -> int | None:
+    try:
+        return current_user.id
+    except RuntimeError:
+        return None
+
+
+def record_task_change(
+    action: str, 
+    before: dict | None = None, 
+    after: dict | None = None, 
+    change_seq: int | None = None
+) -> TaskChange:
+    """
+    Record a task change of the current request, it's applied by `commit_task_changes`.
+    """
+    change = TaskChange(action, (after or before)["id"], before, after, get_change_user_id(), change_seq)
+    g.setdefault("task_changes", []).append(change)
+    return change
+
+
+def commit_task_changes() -> list[TaskChange]:
+    """
+    Commit the session together with everything derived from the recorded
+    task changes (search index, statistics, change sequence, webhook outbox, 
+    history), in the same transaction.
+    
+    Task versions (ETags) are bumped, the cached JSON of deleted tasks 
+    dropped and the changes published to the event feed once committed.
+    """
+    changes: list[TaskChange] = g.pop("task_changes", [])
+    index_task_changes(changes)
+    apply_task_stats(changes)
+    apply_task_sync(changes)
+    enqueue_task_webhooks(changes)
+    write_task_history(changes)
+    db_session.commit()
+    bump_task_versions(changes)
+    delete_task_fragments(changes)
+    publish_task_changes(changes)
+    return changes
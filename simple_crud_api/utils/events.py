@@ -0,0 +1,72 @@
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from threading import Condition
+
+from .. import settings
+
+
+@dataclass
+class TaskEvent:
+    id: int
+    # create, update, assign or delete
+    action: str
+    task_id: int
+    before: dict | None
+    after: dict | None
+
+
+class TaskEventBroker:
+    """
+    In process publish/subscribe of task changes.
+
+    The last `size` events are kept in a ring buffer, subscribers wait for
+    events after the last id they got, so a reconnecting client resumes
+    from its `Last-Event-ID` as long as the buffer still has it.
+    """
+
+    def __init__(self, size: int):
+        self.events: deque[TaskEvent] = deque(maxlen=size)
+        self.last_id = 0
+        self.condition = Condition()
+
+    def publish(self, changes: list) -> None:
+        if not changes:
+            return
+        with self.condition:
+            for change in changes:
+                self.last_id += 1
+                self.events.append(
+                    TaskEvent(self.last_id, change.action, change.task_id, change.before, change.after)
+                )
+            self.condition.notify_all()
+
+    def wait(self, event_id: int, timeout: float) -> tuple[list[TaskEvent], bool, int]:
+        """
+        Events after `event_id`, waits up to `timeout` seconds for one.
+
+        Also returns whether no event was missed since `event_id` (it may 
+        have left the buffer, or be from before a restart) and the id to 
+        wait from next.
+        """
+        with self.condition:
+            if event_id == self.last_id:
+                self.condition.wait(timeout)
+            first_id = self.events[0].id if self.events else self.last_id + 1
+            if not first_id - 1 <= event_id <= self.last_id:
+                return [], False, self.last_id
+            return [e for e in self.events if e.id > event_id], True, self.last_id
+
+
+def serialize_task_state(state: dict) -> dict:
+    """
+    JSON ready task state of a change record.
+    """
+    return {k: v.value if isinstance(v, Enum) else v for k, v in state.items()}
+
+
+broker = TaskEventBroker(int(settings.TASK_EVENTS_BUFFER))
+
+
+def publish_task_changes(changes: list) -> None:
+    broker.publish(changes)
@@ -0,0 +1,22 @@
+class InvalidFields(ValueError):
+    pass
+
+
+def get_requested_fields(value: str | None, allowed: list[str]) -> list[str] | None:
+    """
+    Parse the `fields` query parameter (comma separated column names).
+
+    Returns None when all the fields are requested, raises `InvalidFields`
+    for unknown fields.
+    """
+    if not value:
+        return None
+    fields = []
+    for field in value.split(","):
+        field = field.strip()
+        if not field or field in fields:
+            continue
+        if field not in allowed:
+            raise InvalidFields("Invalid field '%s', accepted fields (%s)" % (field, ", ".join(allowed)))
+        fields.append(field)
+    return fields or None
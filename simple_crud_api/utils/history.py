@@ -0,0 +1,50 @@
+from enum import Enum
+
+from sqlalchemy import insert
+
+from ..database import db_session
+from ..models.task import utcnow
+from ..models.task_history import TaskHistory
+
+
+# task fields whose changes are recorded
+TASK_HISTORY_FIELDS = (
+    "description",
+    "body",
+    "status",
+    "assigned_by_id",
+    "assigned_to_id"
+)
+
+
+def history_value(value) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def get_task_history_rows(changes: list) -> list[dict]:
+    now = utcnow()
+    rows = []
+    for change in changes:
+        row = {"task_id": change.task_id, "action": change.action, "user_id": change.user_id, "created_at": now}
+        if change.before is None or change.after is None:
+            rows.append({**row, "field": None, "old_value": None, "new_value": None})
+            continue
+        for field in TASK_HISTORY_FIELDS:
+            old, new = change.before[field], change.after[field]
+            if old != new:
+                rows.append({**row, "field": field, "old_value": history_value(old), "new_value": history_value(new)})
+    return rows
+
+
+def write_task_history(changes: list) -> None:
+    """
+    Append the history of the task changes with one multi-row INSERT,
+    in the transaction of the changes.
+    """
+    rows = get_task_history_rows(changes)
+    if rows:
+        db_session.execute(insert(TaskHistory).values(rows))
@@ -0,0 +1,108 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from .. import settings
+from ..database import db_session
+from ..models.user import User
+
+
+# user columns kept in an identity snapshot
+USER_IDENTITY_FIELDS = (
+    "id",
+    "role",
+    "active",
+    "username",
+    "email"
+)
+
+
+class UserIdentityCache:
+    """
+    Per process LRU cache of user identity snapshots, entries expire
+    after `ttl` seconds.
+
+    Snapshots are plain dicts, never session bound objects, so a cached
+    user is not shared between requests (and their scoped sessions).
+    Invalidation only reaches this process, other processes see a change
+    after `ttl` at most.
+    """
+
+    def __init__(self, size: int, ttl: float):
+        self.size = size
+        self.ttl = ttl
+        self.entries: OrderedDict[int, tuple[float, dict]] = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> dict | None:
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None or entry[0] < time.monotonic():
+                self.misses += 1
+                return None
+            self.entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, user_id: int, snapshot: dict) -> None:
+        with self.lock:
+            self.entries[user_id] = (time.monotonic() + self.ttl, snapshot)
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+identity_cache = UserIdentityCache(
+    int(settings.USER_IDENTITY_CACHE_SIZE),
+    float(settings.USER_IDENTITY_CACHE_TTL)
+)
+
+
+def user_snapshot(user: User) -> dict:
+    return {f: getattr(user, f) for f in USER_IDENTITY_FIELDS}
+
+
+def user_from_snapshot(snapshot: dict) -> User:
+    """
+    Persistent user of the current session built from a snapshot, without
+    a query. The other columns are loaded on first access.
+    """
+    user = User.__mapper__.class_manager.new_instance()
+    for field, value in snapshot.items():
+        setattr(user, field, value)
+    make_transient_to_detached(user)
+    return db_session.merge(user, load=False)
+
+
+def load_user_identity(user_id: int) -> User | None:
+    """
+    User of a JWT identity, from the identity cache when it has it.
+    """
+    snapshot = identity_cache.get(user_id)
+    if snapshot is not None:
+        return user_from_snapshot(snapshot)
+
+    user = db_session.query(User).filter_by(id=user_id).one_or_none()
+    if user:
+        identity_cache.set(user_id, user_snapshot(user))
+    return user
+
+
+def invalidate_user_identity(user_id: int) -> None:
+    """
+    Forget the cached identity of a user, after its role, status or
+    credentials changed.
+    """
+    identity_cache.invalidate(user_id)
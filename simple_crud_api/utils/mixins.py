@@ -1,6 +1,19 @@
 
+from flask import g
+
+
 class UserVerifyMixin:
-    checked_user = None
+    
+    @property
+    def checked_user(self):
+        """
+        User found by the last check of the current request.
+        """
+        return g.get("checked_user")
+    
+    @checked_user.setter
+    def checked_user(self, value):
+        g.checked_user = value
     
     def check_user_exists(self, username: str) -> bool:
         self.checked_user = self.db_session.query(self.user_model).where(self.user_model.username==username).all()
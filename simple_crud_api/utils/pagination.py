@@ -0,0 +1,69 @@
+import json
+import base64
+
+from .. import settings
+
+
+class InvalidPageRequest(ValueError):
+    pass
+
+
+def get_page_size(value: str | None) -> int:
+    """
+    Return the page size requested by the client.
+
+    Falls back to `TASK_PAGE_SIZE` when no limit is given and never
+    exceeds `TASK_PAGE_SIZE_MAX`.
+    """
+    if value is None or value == "":
+        return int(settings.TASK_PAGE_SIZE)
+    try:
+        limit = int(value)
+    except ValueError:
+        raise InvalidPageRequest("Invalid limit")
+    if limit < 1:
+        raise InvalidPageRequest("Limit must be a positive number")
+    return min(limit, int(settings.TASK_PAGE_SIZE_MAX))
+
+
+def encode_cursor(**kargs) -> str:
+    """
+    Opaque cursor for keyset pagination, safe to pass in query string.
+    """
+    return base64.urlsafe_b64encode(
+        json.dumps(kargs, separators=(",", ":")).encode(settings.ENCODING)
+        ).decode(settings.ENCODING)
+
+
+def decode_cursor(cursor: str | None) -> dict | None:
+    if not cursor:
+        return None
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode(settings.ENCODING)))
+    except Exception:
+        raise InvalidPageRequest("Invalid cursor")
+    if not isinstance(data, dict) or not isinstance(data.get("id"), int):
+        raise InvalidPageRequest("Invalid cursor")
+    return data
+
+
+def decode_sync_token(token: str | None) -> dict | None:
+    """
+    Position of a delta sync token, the change sequence number `seq` and,
+    for a sync with more pages, the `id` of the last task served at that
+    number. `0` syncs from the start.
+    """
+    if not token:
+        return None
+    if token == "0":
+        return {"seq": 0}
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token.encode(settings.ENCODING)))
+    except Exception:
+        raise InvalidPageRequest("Invalid sync token")
+    if (
+        not isinstance(data, dict) or not isinstance(data.get("seq"), int) or 
+        not isinstance(data.get("id", 0), int)
+    ):
+        raise InvalidPageRequest("Invalid sync token")
+    return data
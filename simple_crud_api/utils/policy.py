@@ -0,0 +1,75 @@
+from sqlalchemy import false, true
+
+from .user import UserType
+
+
+# the role can act on every task, or on none
+ALL = "all"
+NONE = "none"
+
+# action -> role -> tasks the role can act on: all, none, or the tasks
+# whose owner column is the user id
+TASK_RULES = {
+    "view": {
+        UserType.Manager: ALL,
+        UserType.TeamLead: "created_by_id",
+        UserType.Employee: "assigned_to_id"
+    },
+    "create": {
+        UserType.Manager: ALL,
+        UserType.TeamLead: ALL,
+        UserType.Employee: NONE
+    },
+    # employee updates the status only, see `TUESerializer`
+    "update": {
+        UserType.Manager: ALL,
+        UserType.TeamLead: "created_by_id",
+        UserType.Employee: "assigned_to_id"
+    },
+    "assign": {
+        UserType.Manager: ALL,
+        UserType.TeamLead: "created_by_id",
+        UserType.Employee: NONE
+    },
+    "delete": {
+        UserType.Manager: ALL,
+        UserType.TeamLead: "created_by_id",
+        UserType.Employee: NONE
+    },
+}
+
+
+def get_task_rule(role: UserType, action: str) -> str:
+    return TASK_RULES[action].get(role, NONE)
+
+
+def can_act(role: UserType, action: str) -> bool:
+    """
+    Whether the role can do `action` on any task at all.
+    """
+    return get_task_rule(role, action) != NONE
+
+
+def task_predicate(user, role: UserType, action: str, model):
+    """
+    WHERE clause of the tasks `user` can do `action` on, `model` has the
+    task owner columns (task, archived task, tombstone).
+    """
+    rule = get_task_rule(role, action)
+    if rule == ALL:
+        return true()
+    if rule == NONE:
+        return false()
+    return getattr(model, rule) == user.id
+
+
+def task_allowed(user, role: UserType, action: str, state: dict) -> bool:
+    """
+    `task_predicate` for a task already read, `state` has the owner columns.
+    """
+    rule = get_task_rule(role, action)
+    if rule == ALL:
+        return True
+    if rule == NONE:
+        return False
+    return state[rule] == user.id
@@ -0,0 +1,85 @@
+from hashlib import sha1
+
+from flask import current_app
+
+from .. import settings
+from ..cache import cache
+
+
+TASK_LIST_CACHE_KEY = "task_list:{}:{}:{}"
+TASK_LIST_CACHE_HITS_KEY = "task_list_cache:hits"
+TASK_LIST_CACHE_MISSES_KEY = "task_list_cache:misses"
+TASK_FRAGMENT_KEY = "task_json:{}:{}"
+
+
+def task_list_cache_key(scope: str, version: str, args) -> str:
+    """
+    Cache key of a task list response: the role scope, the scope version
+    (see `utils.versions`) and the query parameters.
+
+    A task write replaces the version of the scopes it touches,
+    which leaves their cached responses unused until they expire.
+    """
+    args_hash = sha1(repr(sorted(args.items(multi=True))).encode()).hexdigest()
+    return TASK_LIST_CACHE_KEY.format(scope, version, args_hash)
+
+
+def get_task_list_response(key: str) -> bytes | None:
+    body = cache.get(key)
+    cache.cache.inc(TASK_LIST_CACHE_MISSES_KEY if body is None else TASK_LIST_CACHE_HITS_KEY)
+    return body
+
+
+def set_task_list_response(key: str, body: bytes) -> None:
+    cache.set(key, body, timeout=int(settings.TASK_LIST_CACHE_TIMEOUT))
+
+
+def get_task_list_cache_stats() -> dict:
+    hits, misses = cache.get_many(TASK_LIST_CACHE_HITS_KEY, TASK_LIST_CACHE_MISSES_KEY)
+    return {"hits": hits or 0, "misses": misses or 0}
+
+
+def task_fragment_key(task_id: int, change_seq: int) -> str:
+    """
+    Cache key of the JSON of a task at its change sequence number, never 
+    reused: every task write (including the create of a task reusing the id 
+    of a deleted one) stamps a new number.
+    """
+    return TASK_FRAGMENT_KEY.format(task_id, change_seq)
+
+
+def get_task_fragments(rows: list, load) -> list[bytes]:
+    """
+    JSON encoded tasks of `rows` (with `id` and `change_seq`), in order.
+    
+    Fragments are cached per task id and change sequence number, `load(ids)`
+    returns the `(change_seq, dict)` of the tasks missing from the cache, 
+    which are encoded and cached. Tasks deleted in between are left out.
+    """
+    keys = [task_fragment_key(row.id, row.change_seq) for row in rows]
+    fragments = dict(zip(keys, cache.get_many(*keys))) if keys else {}
+    
+    missing = {row.id: key for row, key in zip(rows, keys) if fragments[key] is None}
+    if missing:
+        loaded = {}
+        for change_seq, data in load(list(missing)):
+            fragment = current_app.json.dumps(data).encode()
+            # the task may have changed since `rows`, served as loaded and 
+            # cached under the loaded change sequence number
+            fragments[missing[data["id"]]] = fragment
+            loaded[task_fragment_key(data["id"], change_seq)] = fragment
+        cache.set_many(loaded, timeout=int(settings.TASK_FRAGMENT_CACHE_TIMEOUT))
+    
+    return [fragments[key] for key in keys if fragments[key] is not None]
+
+
+def delete_task_fragments(changes: list) -> None:
+    """
+    Drop the cached JSON of the deleted and archived tasks, once committed.
+    """
+    keys = [
+        task_fragment_key(change.task_id, change.change_seq) for change in changes 
+        if change.after is None and change.change_seq is not None
+    ]
+    if keys:
+        cache.delete_many(*keys)
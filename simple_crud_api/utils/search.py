@@ -0,0 +1,119 @@
+from sqlalchemy import (
+    and_,
+    literal_column,
+    or_,
+    select,
+    table,
+    text
+)
+from sqlalchemy.dialects.mysql import match
+
+from ..database import db_session
+
+
+FTS_TABLE = "task_fts"
+
+
+def get_dialect_name() -> str:
+    return db_session.get_bind().dialect.name
+
+
+def fts_query(q: str) -> str:
+    """
+    Quote every term so user input can't use FTS5 query syntax,
+    terms are matched together (AND).
+    """
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in q.split())
+
+
+def boolean_mode_query(q: str) -> str:
+    """
+    MySQL boolean mode query of `fts_query`: every term is required (`+`) 
+    and quoted so user input can't use the boolean operators. MySQL phrases 
+    have no escaping, double quotes are dropped from the terms.
+    """
+    terms = [term.replace('"', '') for term in q.split()]
+    return " ".join('+"{}"'.format(term) for term in terms if term)
+
+
+def search_clause(model, q: str):
+    """
+    WHERE clause matching tasks containing all the words of `q`, in 
+    description or body. The terms are matched as given, the same on 
+    every database: no operators, no relevance ranking.
+    
+    MySQL uses the FULLTEXT index on task (boolean mode), SQLite uses the 
+    `task_fts` FTS5 table kept in sync by `index_task_changes`.
+    """
+    dialect = get_dialect_name()
+    if dialect == "mysql":
+        return match(model.description, model.body, against=boolean_mode_query(q)).in_boolean_mode()
+
+    if dialect == "sqlite":
+        matched_ids = (
+            select(literal_column("rowid"))
+            .select_from(table(FTS_TABLE))
+            .where(text(f"{FTS_TABLE} MATCH :fts_query").bindparams(fts_query=fts_query(q)))
+        )
+        return model.id.in_(matched_ids)
+
+    # no full text index, scan
+    return and_(*[
+        or_(model.description.contains(term, autoescape=True), model.body.contains(term, autoescape=True))
+        for term in q.split()
+    ])
+
+
+def index_tasks(tasks: list[dict]) -> None:
+    """
+    Add or replace tasks (`id`, `description` and `body`) in the search index.
+    """
+    if get_dialect_name() != "sqlite" or not tasks:
+        return
+    unindex_tasks([task["id"] for task in tasks])
+    db_session.execute(
+        text(f"INSERT INTO {FTS_TABLE} (rowid, description, body) VALUES (:id, :description, :body)"),
+        [{"id": task["id"], "description": task["description"], "body": task["body"]} for task in tasks]
+    )
+
+
+def unindex_tasks(task_ids: list[int]) -> None:
+    if get_dialect_name() != "sqlite" or not task_ids:
+        return
+    db_session.execute(
+        text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), 
+        [{"id": task_id} for task_id in task_ids]
+    )
+
+
+def index_task_changes(changes: list) -> None:
+    """
+    Update the search index for task changes, tasks are only re-indexed 
+    when their description or body changed.
+    """
+    indexed, unindexed = [], []
+    for change in changes:
+        if change.after is None:
+            unindexed.append(change.task_id)
+        elif (
+            change.before is None or 
+            change.before["description"] != change.after["description"] or 
+            change.before["body"] != change.after["body"]
+        ):
+            indexed.append(change.after)
+    unindex_tasks(unindexed)
+    index_tasks(indexed)
+
+
+def rebuild_search_index() -> None:
+    """
+    Recreate the SQLite search index from the task table.
+    """
+    if get_dialect_name() != "sqlite":
+        return
+    db_session.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+    db_session.execute(text(f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(description, body)"))
+    db_session.execute(text(
+        f"INSERT INTO {FTS_TABLE} (rowid, description, body) SELECT id, description, body FROM task"
+    ))
+    db_session.commit()
@@ -1,15 +1,154 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore, Lock
+from time import perf_counter
+
 import bcrypt
-from ...settings import ENCODING
+from ...cache import cache
+from ...settings import (
+    ENCODING,
+    PASSWORD_HASH_QUEUE,
+    PASSWORD_HASH_ROUNDS,
+    PASSWORD_HASH_WORKERS
+)
+
+
+class PasswordHasherBusy(Exception):
+    """
+    Too many password hashes waiting, the request should be retried later.
+    """
+
+
+class PasswordHashPool:
+    """
+    Bounded thread pool running the bcrypt hashes off the request workers.
+
+    At most `workers` hashes run at once (bcrypt releases the GIL), up to
+    `max_queue` more wait for a thread, beyond that `run` fails at once
+    with `PasswordHasherBusy` instead of holding the request worker.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.slots = BoundedSemaphore(workers + max_queue)
+        self.executor: ThreadPoolExecutor | None = None
+        self.lock = Lock()
+        self.completed = 0
+        self.rejected = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def get_executor(self) -> ThreadPoolExecutor:
+        # created on first use, not in a parent process forking workers
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix="password-hash")
+            return self.executor
+
+    def record_wait(self, wait: float) -> None:
+        with self.lock:
+            self.completed += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def run(self, func, *args):
+        """
+        Run `func(*args)` in the pool and wait for its result.
+        """
+        if not self.slots.acquire(blocking=False):
+            with self.lock:
+                self.rejected += 1
+            raise PasswordHasherBusy()
+
+        queued_at = perf_counter()
+
+        def task():
+            self.record_wait(perf_counter() - queued_at)
+            return func(*args)
+
+        try:
+            return self.get_executor().submit(task).result()
+        finally:
+            self.slots.release()
+
+    def get_stats(self) -> dict:
+        """
+        Hashes run and rejected, and their wait for a thread in milliseconds.
+        """
+        with self.lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "wait_avg_ms": round(self.wait_total / self.completed * 1000, 3) if self.completed else 0,
+                "wait_max_ms": round(self.wait_max * 1000, 3)
+            }
+
+
+hash_pool = PasswordHashPool(int(PASSWORD_HASH_WORKERS), int(PASSWORD_HASH_QUEUE))
+
+# calibrated work factor shared by the processes using the cache
+HASH_ROUNDS_KEY = "password_hash_rounds"
+
+# bcrypt work factor of new hashes
+hash_rounds = int(PASSWORD_HASH_ROUNDS)
+
+
+def set_hash_rounds(rounds: int) -> None:
+    global hash_rounds
+    hash_rounds = rounds
+
+
+def calibrate_hash_rounds(target_ms: float, min_rounds: int = 4) -> int:
+    """
+    Highest bcrypt work factor whose hash takes at most `target_ms` on this
+    machine, not below `min_rounds`. Each round doubles the time, so this
+    takes about twice the target.
+    """
+    rounds = min_rounds
+    while rounds < 31:
+        start = perf_counter()
+        bcrypt.hashpw(b"calibration", bcrypt.gensalt(rounds + 1))
+        if (perf_counter() - start) * 1000 > target_ms:
+            break
+        rounds += 1
+    return rounds
+
+
+def load_hash_rounds(target_ms: float, min_rounds: int = 4) -> int:
+    """
+    Work factor calibrated by the first process to start, kept in the cache
+    so every worker uses the same one. A worker calibrating on its own would
+    pick a different work factor near a round boundary, and `needs_rehash`
+    would rewrite the hashes of its users on every other login.
+    """
+    rounds = cache.get(HASH_ROUNDS_KEY)
+    if rounds is None:
+        cache.add(HASH_ROUNDS_KEY, calibrate_hash_rounds(target_ms, min_rounds), timeout=0)
+        rounds = cache.get(HASH_ROUNDS_KEY)
+    return rounds
+
+
+def get_hash_rounds(hashed_password: str) -> int:
+    """
+    Work factor of a bcrypt hash, `$2b$<rounds>$...`.
+    """
+    return int(hashed_password.split("$")[2])
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    return get_hash_rounds(hashed_password) != hash_rounds
 
 
 def make_password(byte_password: bytes, /) -> bytes:
-    return bcrypt.hashpw(byte_password, bcrypt.gensalt())
-    
-def check_password(raw_password: str, hashed_password: str, /, encoding: str = ENCODING) -> bool: 
+    return hash_pool.run(bcrypt.hashpw, byte_password, bcrypt.gensalt(hash_rounds))
+
+def check_password(raw_password: str, hashed_password: str, /, encoding: str = ENCODING) -> bool:
     byte_password = raw_password.encode(encoding)
     byte_hashed_password = hashed_password.encode(encoding)
-    return bcrypt.checkpw(byte_password, byte_hashed_password)
+    return hash_pool.run(bcrypt.checkpw, byte_password, byte_hashed_password)
 
 def generate_hashed_password(raw_password: str = None, /, encoding: str = ENCODING) -> str:
     byte_password = raw_password.encode(encoding)
-    return make_password(byte_password).decode(encoding)
\ No newline at end of file
+    return make_password(byte_password).decode(encoding)
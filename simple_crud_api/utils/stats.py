@@ -0,0 +1,106 @@
+from collections import Counter
+
+from sqlalchemy import (
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    update
+)
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from ..database import db_session
+from ..models.task import Task
+from ..models.task_stat import TaskStat
+
+
+def task_stat_keys(state: dict) -> list[tuple]:
+    return [
+        (TaskStat.ASSIGNEE, state["assigned_to_id"] or 0, state["status"]),
+        (TaskStat.CREATOR, state["created_by_id"] or 0, state["status"]),
+    ]
+
+
+def get_task_stat_deltas(changes: list) -> Counter:
+    deltas = Counter()
+    for change in changes:
+        if change.before:
+            deltas.subtract(task_stat_keys(change.before))
+        if change.after:
+            deltas.update(task_stat_keys(change.after))
+    return deltas
+
+
+def apply_task_stats(changes: list) -> None:
+    """
+    Apply the counter deltas of task changes, in one upsert statement 
+    on MySQL and SQLite.
+    """
+    deltas = get_task_stat_deltas(changes)
+    # sorted, so concurrent transactions lock counters in the same order
+    rows = [
+        {"scope": scope, "user_id": user_id, "status": status, "count": count}
+        for (scope, user_id, status), count in sorted(deltas.items(), key=lambda x: (x[0][0], x[0][1], x[0][2].name))
+        if count
+    ]
+    if not rows:
+        return
+    
+    dialect = db_session.get_bind().dialect.name
+    if dialect == "mysql":
+        stmt = mysql_insert(TaskStat).values(rows)
+        db_session.execute(stmt.on_duplicate_key_update(count=TaskStat.count + stmt.inserted["count"]))
+        return
+    
+    if dialect == "sqlite":
+        stmt = sqlite_insert(TaskStat).values(rows)
+        db_session.execute(stmt.on_conflict_do_update(
+            index_elements=[TaskStat.scope, TaskStat.user_id, TaskStat.status],
+            set_={"count": TaskStat.count + stmt.excluded["count"]}
+        ))
+        return
+    
+    for row in rows:
+        updated = db_session.execute(
+            update(TaskStat)
+            .where(TaskStat.scope == row["scope"], TaskStat.user_id == row["user_id"], TaskStat.status == row["status"])
+            .values(count=TaskStat.count + row["count"])
+        )
+        if not updated.rowcount:
+            db_session.execute(insert(TaskStat).values(**row))
+
+
+def get_task_stats() -> dict:
+    """
+    Task counts per status, per assignee and per creator. User id 0 is 
+    for tasks without assignee or creator.
+    """
+    data = {"by_assignee": {}, "by_creator": {}, "total": {}}
+    rows = db_session.execute(
+        select(TaskStat.scope, TaskStat.user_id, TaskStat.status, TaskStat.count).where(TaskStat.count != 0)
+    )
+    for scope, user_id, status, count in rows:
+        key = "by_assignee" if scope == TaskStat.ASSIGNEE else "by_creator"
+        data[key].setdefault(str(user_id), {})[status.value] = count
+        if scope == TaskStat.CREATOR:
+            data["total"][status.value] = data["total"].get(status.value, 0) + count
+    return data
+
+
+def rebuild_task_stats() -> None:
+    """
+    Recount the task statistics from the task table, repairs any drift.
+    """
+    db_session.execute(delete(TaskStat))
+    for scope, column in ((TaskStat.ASSIGNEE, Task.assigned_to_id), (TaskStat.CREATOR, Task.created_by_id)):
+        user_id = func.coalesce(column, 0)
+        db_session.execute(
+            insert(TaskStat).from_select(
+                ["scope", "user_id", "status", "count"],
+                select(literal(scope), user_id, Task.status, func.count(Task.id))
+                .group_by(user_id, Task.status)
+            )
+        )
+    db_session.commit()
@@ -0,0 +1,64 @@
+from sqlalchemy import insert, select, update
+
+from ..database import db_session
+from ..models.task import Task, utcnow
+from ..models.task_sync import TaskSequence, TaskTombstone
+
+
+def next_task_change_seq() -> int:
+    """
+    Next task change sequence number, the counter row stays locked until
+    the transaction ends so concurrent writers commit their numbers in order.
+    """
+    result = db_session.execute(
+        update(TaskSequence)
+        .where(TaskSequence.name == TaskSequence.TASK)
+        .values(value=TaskSequence.value + 1)
+    )
+    if result.rowcount == 0:
+        db_session.execute(insert(TaskSequence).values(name=TaskSequence.TASK, value=1))
+        return 1
+    return get_task_change_seq()
+
+
+def get_task_change_seq() -> int:
+    """
+    Last committed task change sequence number.
+    """
+    value = db_session.execute(
+        select(TaskSequence.value).where(TaskSequence.name == TaskSequence.TASK)
+    ).scalar()
+    return value or 0
+
+
+def apply_task_sync(changes: list) -> None:
+    """
+    Stamp the changed tasks with a new change sequence number, and keep
+    a tombstone of the deleted ones, in the transaction of the changes.
+    """
+    if not changes:
+        return
+    seq = next_task_change_seq()
+    now = utcnow()
+
+    changed_ids = sorted({change.task_id for change in changes if change.after is not None})
+    if changed_ids:
+        db_session.execute(
+            update(Task)
+            .where(Task.id.in_(changed_ids))
+            .values(change_seq=seq, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+
+    deleted = [change.before for change in changes if change.after is None]
+    if deleted:
+        db_session.execute(insert(TaskTombstone), [
+            {
+                "task_id": state["id"],
+                "change_seq": seq,
+                "created_by_id": state["created_by_id"],
+                "assigned_to_id": state["assigned_to_id"],
+                "deleted_at": now
+            }
+            for state in deleted
+        ])
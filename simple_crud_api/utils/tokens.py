@@ -0,0 +1,110 @@
+import time
+from dataclasses import dataclass
+from threading import Lock
+
+from flask import current_app, request
+from sqlalchemy import select
+
+from .. import settings
+from ..database import db_session
+from ..models.user import User
+from .user import UserType
+
+
+@dataclass
+class TokenUser:
+    """
+    User of a JWT from its claims, the current user of views authorizing
+    without the user row (`token_claims = True` on the view class).
+    """
+    id: int
+    role: UserType
+    active: bool
+    token_version: int
+
+
+def token_claims(user: User) -> dict:
+    """
+    Additional claims of the access and refresh tokens of `user`.
+    """
+    return {
+        "role": user.role.value,
+        "active": user.active,
+        "token_version": user.token_version or 0
+    }
+
+
+def get_token_user(jwt_data: dict) -> TokenUser | None:
+    """
+    User of the claims when the current view authorizes from them, None
+    otherwise or for tokens issued without the claims.
+    """
+    view = current_app.view_functions.get(request.endpoint)
+    if not getattr(getattr(view, "view_class", None), "token_claims", False):
+        return None
+    if "role" not in jwt_data:
+        return None
+    return TokenUser(
+        id=int(jwt_data["sub"]),
+        role=UserType(jwt_data["role"]),
+        active=jwt_data["active"],
+        token_version=jwt_data["token_version"]
+    )
+
+
+class TokenRevocations:
+    """
+    Per process view of the revoked tokens: the current token version of
+    every user who ever revoked their tokens, tokens with an older version
+    are revoked.
+
+    Reloaded from the user table every `interval` seconds, so revocations
+    made by other processes apply after `interval` at most.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.versions: dict[int, int] = {}
+        self.expires_at = 0.0
+        self.lock = Lock()
+
+    def refresh(self) -> None:
+        rows = db_session.execute(
+            select(User.id, User.token_version).where(User.token_version > 0)
+        ).all()
+        with self.lock:
+            self.versions = dict(rows)
+            self.expires_at = time.monotonic() + self.interval
+
+    def is_revoked(self, user_id: int, token_version: int) -> bool:
+        if time.monotonic() >= self.expires_at:
+            self.refresh()
+        return token_version < self.versions.get(user_id, 0)
+
+    def revoke(self, user_id: int, token_version: int) -> None:
+        """
+        Revoke the tokens of the user older than `token_version` right away
+        in this process, once the new version is committed.
+        """
+        with self.lock:
+            self.versions[user_id] = max(token_version, self.versions.get(user_id, 0))
+
+
+token_revocations = TokenRevocations(float(settings.TOKEN_REVOCATION_REFRESH_INTERVAL))
+
+
+def bump_token_version(user: User) -> int:
+    """
+    Increment the token version of the user, returns the new version to
+    pass to `token_revocations.revoke` after commit.
+    """
+    user.token_version = (user.token_version or 0) + 1
+    return user.token_version
+
+
+def is_token_revoked(jwt_data: dict) -> bool:
+    try:
+        user_id = int(jwt_data["sub"])
+    except ValueError:
+        return True
+    return token_revocations.is_revoked(user_id, jwt_data.get("token_version", 0))
@@ -0,0 +1,96 @@
+from uuid import uuid4
+
+from .. import settings
+from ..cache import cache
+
+
+# version of one task
+TASK_VERSION_KEY = "task_version:{}"
+# version of the task list of a role scope
+TASK_LIST_VERSION_KEY = "task_list_version:{}"
+
+
+def manager_scope() -> str:
+    return "manager"
+
+
+def created_by_scope(user_id: int) -> str:
+    return f"created_by:{user_id}"
+
+
+def assigned_to_scope(user_id: int) -> str:
+    return f"assigned_to:{user_id}"
+
+
+def new_version() -> str:
+    return uuid4().hex
+
+
+def get_version(key: str) -> str:
+    """
+    Current version of `key`, a new one is started when the cache has none,
+    so an evicted version never matches an old ETag.
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, new_version(), timeout=0)
+        version = cache.get(key)
+    return version
+
+
+def get_task_version(task_id: int) -> str | None:
+    """
+    Current version of the task, None when the cache has none. 
+    
+    Task versions are only started by `start_task_version`, for tasks 
+    read and authorized, so requests for any task id don't fill the cache.
+    """
+    return cache.get(TASK_VERSION_KEY.format(task_id))
+
+
+def start_task_version(task_id: int) -> str | None:
+    """
+    Start a version of a task without one, None when one was started in 
+    between (by a write, it may be newer than the task already read).
+    
+    Task versions expire after `TASK_VERSION_CACHE_TIMEOUT`, an expired 
+    version is a new version.
+    """
+    version = new_version()
+    if cache.add(TASK_VERSION_KEY.format(task_id), version, timeout=int(settings.TASK_VERSION_CACHE_TIMEOUT)):
+        return version
+    return None
+
+
+def get_task_list_version(scope: str) -> str:
+    return get_version(TASK_LIST_VERSION_KEY.format(scope))
+
+
+def get_task_change_scopes(changes: list) -> set[str]:
+    """
+    Task list scopes affected by the changes: managers, and the creator
+    and assignee of the task before and after the change.
+    """
+    scopes = {manager_scope()}
+    for change in changes:
+        for state in (change.before, change.after):
+            if not state:
+                continue
+            if state["created_by_id"]:
+                scopes.add(created_by_scope(state["created_by_id"]))
+            if state["assigned_to_id"]:
+                scopes.add(assigned_to_scope(state["assigned_to_id"]))
+    return scopes
+
+
+def bump_task_versions(changes: list) -> None:
+    """
+    New versions for the changed tasks and the task lists they are part of,
+    called once the changes are committed.
+    """
+    if not changes:
+        return
+    task_keys = [TASK_VERSION_KEY.format(change.task_id) for change in changes]
+    cache.set_many({key: new_version() for key in task_keys}, timeout=int(settings.TASK_VERSION_CACHE_TIMEOUT))
+    list_keys = [TASK_LIST_VERSION_KEY.format(scope) for scope in get_task_change_scopes(changes)]
+    cache.set_many({key: new_version() for key in list_keys}, timeout=0)
@@ -0,0 +1,184 @@
+import hashlib
+import hmac
+import json
+import random
+import time
+from datetime import timedelta
+
+import requests
+from requests.adapters import HTTPAdapter
+from sqlalchemy import delete, func, insert, select, update
+
+from .. import settings
+from ..database import db_session
+from ..models.task import utcnow
+from ..models.task_outbox import TaskOutbox
+from .events import serialize_task_state
+
+
+def get_webhook_urls() -> list[str]:
+    return [url.strip() for url in (settings.TASK_WEBHOOK_URLS or "").split(",") if url.strip()]
+
+
+def enqueue_task_webhooks(changes: list) -> None:
+    """
+    Add the task changes to the outbox of every webhook, in the
+    transaction of the changes.
+    """
+    urls = get_webhook_urls()
+    if not urls or not changes:
+        return
+    now = utcnow()
+    rows = []
+    for change in changes:
+        payload = json.dumps({
+            "action": change.action,
+            "task_id": change.task_id,
+            "task": serialize_task_state(change.after) if change.after else None,
+            "occurred_at": now.isoformat()
+        }, separators=(",", ":"), sort_keys=True)
+        for url in urls:
+            rows.append({
+                "url": url,
+                "task_id": change.task_id,
+                "action": change.action,
+                "payload": payload,
+                "attempts": 0,
+                "created_at": now,
+                "next_attempt_at": now
+            })
+    db_session.execute(insert(TaskOutbox), rows)
+
+
+def sign_payload(secret: str, timestamp: str, body: bytes) -> str:
+    """
+    `X-Webhook-Signature` of a request, HMAC-SHA256 of `<timestamp>.<body>`.
+    """
+    message = timestamp.encode() + b"." + body
+    return "sha256=" + hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+class WebhookDispatcher:
+    """
+    Send the outbox to the webhooks, a batch at a time.
+
+    Only the oldest pending change of each task and webhook is sent in a
+    batch, so a task's changes arrive in order even when one is retried.
+    Failed requests are retried with exponential backoff, until
+    `TASK_WEBHOOK_MAX_ATTEMPTS`. HTTP connections are pooled and kept alive
+    between batches.
+    
+    A batch is claimed in a short transaction (leased by moving its 
+    `next_attempt_at`), sent outside of any transaction, and the results 
+    recorded in a second short transaction, so no lock is held on the 
+    outbox while waiting on the webhooks.
+    """
+
+    def __init__(self, secret: str, http: requests.Session | None = None):
+        self.secret = secret
+        self.http = http or self.make_session()
+        self.batch_size = int(settings.TASK_WEBHOOK_BATCH_SIZE)
+        self.timeout = float(settings.TASK_WEBHOOK_TIMEOUT)
+        self.max_attempts = int(settings.TASK_WEBHOOK_MAX_ATTEMPTS)
+        self.retry_delay = float(settings.TASK_WEBHOOK_RETRY_DELAY)
+
+    @staticmethod
+    def make_session() -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def claim_batch(self) -> list:
+        """
+        Lease the next batch, long enough to send it, and commit. A batch
+        left by a stopped dispatcher is sent again once its lease is over.
+        """
+        heads = (
+            select(func.min(TaskOutbox.id))
+            .where(TaskOutbox.failed_at.is_(None))
+            .group_by(TaskOutbox.url, TaskOutbox.task_id)
+        )
+        rows = db_session.execute(
+            select(TaskOutbox.id, TaskOutbox.url, TaskOutbox.payload, TaskOutbox.attempts)
+            .where(TaskOutbox.id.in_(heads), TaskOutbox.next_attempt_at <= utcnow())
+            .order_by(TaskOutbox.id)
+            .limit(self.batch_size)
+            # several dispatchers can run, each claims different changes
+            .with_for_update(skip_locked=True)
+        ).all()
+        if rows:
+            lease = timedelta(seconds=self.timeout * len(rows) + 60)
+            db_session.execute(
+                update(TaskOutbox)
+                .where(TaskOutbox.id.in_([row.id for row in rows]))
+                .values(next_attempt_at=utcnow() + lease)
+                .execution_options(synchronize_session=False)
+            )
+        db_session.commit()
+        return rows
+
+    def send(self, row) -> bool:
+        body = row.payload.encode()
+        timestamp = str(int(time.time()))
+        headers = {
+            "Content-Type": "application/json",
+            "X-Webhook-Id": str(row.id),
+            "X-Webhook-Timestamp": timestamp,
+            "X-Webhook-Signature": sign_payload(self.secret, timestamp, body)
+        }
+        try:
+            response = self.http.post(row.url, data=body, headers=headers, timeout=self.timeout)
+        except requests.RequestException:
+            return False
+        return 200 <= response.status_code < 300
+
+    def get_retry_delay(self, attempts: int) -> timedelta:
+        delay = min(self.retry_delay * 2 ** (attempts - 1), 3600)
+        return timedelta(seconds=delay * random.uniform(0.5, 1))
+
+    def dispatch(self) -> int:
+        """
+        Send one batch, returns the number of changes tried.
+        """
+        rows = self.claim_batch()
+        # no transaction is open while sending
+        results = [(row, self.send(row)) for row in rows]
+        
+        now = utcnow()
+        sent_ids = [row.id for row, sent in results if sent]
+        for row, sent in results:
+            if sent:
+                continue
+            attempts = row.attempts + 1
+            if attempts >= self.max_attempts:
+                values = {"attempts": attempts, "failed_at": now}
+            else:
+                values = {"attempts": attempts, "next_attempt_at": now + self.get_retry_delay(attempts)}
+            db_session.execute(
+                update(TaskOutbox)
+                .where(TaskOutbox.id == row.id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+        if sent_ids:
+            db_session.execute(
+                delete(TaskOutbox)
+                .where(TaskOutbox.id.in_(sent_ids))
+                .execution_options(synchronize_session=False)
+            )
+        db_session.commit()
+        return len(rows)
+
+    def run(self, once: bool = False) -> None:
+        """
+        Dispatch until interrupted, or until nothing is ready with `once`.
+        """
+        interval = float(settings.TASK_WEBHOOK_POLL_INTERVAL)
+        while True:
+            if self.dispatch():
+                continue
+            if once:
+                return
+            time.sleep(interval)
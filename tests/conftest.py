@@ -0,0 +1,87 @@
+import os
+
+# settings are read at import, the MySQL engine is never connected, the
+# `app` fixture binds the session to SQLite
+os.environ.update({
+    "USERNAME": "test",
+    "PASSWORD": "test",
+    "HOST": "localhost",
+    "PORT": "3306",
+    "DBNAME": "test",
+    "SECRET_KEY": "test",
+    "JWT_SECRET_KEY": "test-jwt-secret-key-of-at-least-32-bytes",
+    "JWT_ACCESS_TOKEN_EXPIRES": "60",
+    "JWT_REFRESH_TOKEN_EXPIRES": "1",
+    "ENCODING": "utf-8",
+    "CACHE_TYPE": "SimpleCache",
+    "CACHE_DEFAULT_TIMEOUT": "300",
+    "PASSWORD_HASH_ROUNDS": "4",
+})
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import create_engine, text
+
+import simple_crud_api
+from simple_crud_api import database
+from simple_crud_api.models import (
+    user,
+    address,
+    validation,
+    task,
+    task_stat,
+    task_sync,
+    task_outbox,
+    task_archive,
+    task_history
+)
+from simple_crud_api.models.user import User
+from simple_crud_api.utils.identity import identity_cache
+from simple_crud_api.utils.search import FTS_TABLE
+from simple_crud_api.utils.tokens import token_revocations
+from simple_crud_api.utils.user import UserType
+
+
+@pytest.fixture
+def app(tmp_path):
+    """
+    App on a fresh SQLite database file, shared by the threads of a test.
+    """
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30}
+    )
+    database.engine = engine
+    database.db_session.configure(bind=engine)
+    database.Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(text(f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(description, body)"))
+    identity_cache.clear()
+    # reloaded from this database on the first token check
+    token_revocations.expires_at = 0.0
+
+    app = simple_crud_api.create_app({"TESTING": True})
+    yield app
+
+    database.db_session.remove()
+    engine.dispose()
+
+
+@pytest.fixture
+def make_user(app):
+    """
+    Create an active user of `role`, returns its id and auth headers.
+    """
+    def make_user(username: str, role: UserType) -> tuple[int, dict]:
+        user = User(username, User.make_passsword("Password123"), f"{username}@example.com")
+        user.role = role
+        user.active = True
+        user.account_activation = True
+        database.db_session.add(user)
+        database.db_session.commit()
+        with app.app_context():
+            token = create_access_token(identity=user, fresh=True)
+        user_id = user.id
+        database.db_session.remove()
+        return user_id, {"Authorization": f"Bearer {token}"}
+    return make_user
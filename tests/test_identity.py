@@ -0,0 +1,52 @@
+from sqlalchemy import update
+
+from simple_crud_api import database
+from simple_crud_api.models.user import User
+from simple_crud_api.utils.identity import identity_cache, invalidate_user_identity, load_user_identity
+from simple_crud_api.utils.user import UserType
+
+
+def test_profile_update_invalidates_identity(app, make_user):
+    client = app.test_client()
+    user_id, headers = make_user("employee", UserType.Employee)
+
+    response = client.get("/api/user", headers=headers)
+    assert response.json["details"]["email"] == "employee@example.com"
+    assert identity_cache.get(user_id) is not None
+
+    response = client.post("/api/user/update", json={"email": "changed@example.com"}, headers=headers)
+    assert response.status_code == 202
+    assert identity_cache.get(user_id) is None
+
+    response = client.get("/api/user", headers=headers)
+    assert response.json["details"]["email"] == "changed@example.com"
+
+
+def test_deactivated_user_identity_is_not_served_from_the_cache(app, make_user):
+    client = app.test_client()
+    user_id, headers = make_user("lead", UserType.TeamLead)
+    assert client.get("/api/user", headers=headers).status_code == 200
+    assert identity_cache.get(user_id)["active"] is True
+
+    response = client.delete("/api/auth/delete", headers=headers)
+    assert response.status_code == 302
+    assert identity_cache.get(user_id) is None
+
+    with app.app_context():
+        assert load_user_identity(user_id).active is False
+    database.db_session.remove()
+
+
+def test_role_change_is_seen_once_invalidated(app, make_user):
+    client = app.test_client()
+    user_id, headers = make_user("manager", UserType.Manager)
+    response = client.get("/api/user", headers=headers)
+    assert response.json["details"]["role"] == UserType.Manager.value
+
+    database.db_session.execute(update(User).where(User.id == user_id).values(role=UserType.Employee))
+    database.db_session.commit()
+    invalidate_user_identity(user_id)
+
+    response = client.get("/api/user", headers=headers)
+    assert response.json["details"]["role"] == UserType.Employee.value
+    assert identity_cache.get(user_id)["role"] == UserType.Employee
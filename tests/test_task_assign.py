@@ -0,0 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+from simple_crud_api.utils.user import UserType
+
+
+def test_concurrent_assignments_have_one_winner(app, make_user):
+    """
+    Many concurrent assignments of the same task, exactly one succeeds and
+    the task ends up assigned to its employee.
+    """
+    client = app.test_client()
+    _, lead = make_user("lead", UserType.TeamLead)
+    employee_ids = [make_user(f"employee{i}", UserType.Employee)[0] for i in range(20)]
+
+    response = client.post("/api/task", json={"description": "task", "body": "body"}, headers=lead)
+    assert response.status_code == 201
+    task_id = response.json["message"]["task"]["id"]
+
+    barrier = Barrier(len(employee_ids))
+
+    def assign(employee_id: int):
+        barrier.wait()
+        response = client.get(f"/api/task/{task_id}/assign/{employee_id}", headers=lead)
+        return employee_id, response.status_code, response.json["message"]
+
+    with ThreadPoolExecutor(len(employee_ids)) as executor:
+        results = list(executor.map(assign, employee_ids))
+
+    winners = [employee_id for employee_id, status, _ in results if status == 200]
+    assert len(winners) == 1
+    assert all(
+        message == "Task already assigned" 
+        for _, status, message in results if status != 200
+    )
+
+    response = client.get(f"/api/task/{task_id}?fields=assigned_to_id", headers=lead)
+    assert response.json["message"]["task"]["assigned_to_id"] == winners[0]
+
+    response = client.get(f"/api/task/{task_id}/history", headers=lead)
+    assigned = [h for h in response.json["history"] if h["field"] == "assigned_to_id"]
+    assert [h["new_value"] for h in assigned] == [str(winners[0])]
+
+
+def test_bulk_assignment_follows_the_single_assignment_rules(app, make_user):
+    client = app.test_client()
+    _, lead = make_user("lead", UserType.TeamLead)
+    employee_id, _ = make_user("employee", UserType.Employee)
+    other_lead_id, _ = make_user("other-lead", UserType.TeamLead)
+
+    response = client.post("/api/task/bulk", json=[{"description": "task", "body": "body"}] * 3, headers=lead)
+    task_ids = [result["task"]["id"] for result in response.json["results"]]
+    # assigned through the single task endpoint first
+    response = client.get(f"/api/task/{task_ids[0]}/assign/{employee_id}", headers=lead)
+    assert response.status_code == 200
+
+    response = client.patch(f"/api/task/bulk/assign/{other_lead_id}", json={"ids": task_ids}, headers=lead)
+    assert response.status_code == 400
+    response = client.patch("/api/task/bulk/assign/999", json={"ids": task_ids}, headers=lead)
+    assert response.status_code == 400
+
+    response = client.patch(f"/api/task/bulk/assign/{employee_id}", json={"ids": task_ids}, headers=lead)
+    assert response.status_code == 202
+    assert response.json["assigned"] == task_ids[1:]
+    assert response.json["not_assigned"] == task_ids[:1]
@@ -0,0 +1,57 @@
+from simple_crud_api.utils.user import UserType
+
+
+def create_task(client, headers) -> int:
+    response = client.post("/api/task", json={"description": "task", "body": "body"}, headers=headers)
+    assert response.status_code == 201
+    return response.json["message"]["task"]["id"]
+
+
+def test_task_etag_changes_with_every_write(app, make_user):
+    client = app.test_client()
+    _, manager = make_user("manager", UserType.Manager)
+    task_id = create_task(client, manager)
+
+    response = client.get(f"/api/task/{task_id}", headers=manager)
+    etag = response.headers["ETag"]
+    assert etag.strip('"').startswith("1.")
+
+    response = client.get(f"/api/task/{task_id}", headers={**manager, "If-None-Match": etag})
+    assert response.status_code == 304
+
+    response = client.put(f"/api/task/{task_id}", json={"description": "changed"}, headers={**manager, "If-Match": etag})
+    assert response.status_code == 202
+    assert response.json["version"] == 2
+
+    response = client.get(f"/api/task/{task_id}", headers={**manager, "If-None-Match": etag})
+    assert response.status_code == 302
+    assert response.json["message"]["task"]["description"] == "changed"
+    assert response.headers["ETag"] != etag
+    assert response.headers["ETag"].strip('"').startswith("2.")
+
+
+def test_stale_if_match_is_412(app, make_user):
+    client = app.test_client()
+    _, manager = make_user("manager", UserType.Manager)
+    lead_id, lead = make_user("lead", UserType.TeamLead)
+    task_id = create_task(client, lead)
+
+    stale = client.get(f"/api/task/{task_id}", headers=lead).headers["ETag"]
+    response = client.put(f"/api/task/{task_id}", json={"status": "in-progress"}, headers=manager)
+    assert response.status_code == 202
+
+    response = client.put(f"/api/task/{task_id}", json={"description": "lost"}, headers={**lead, "If-Match": stale})
+    assert response.status_code == 412
+    assert response.json["version"] == 2
+
+    response = client.delete(f"/api/task/{task_id}", headers={**lead, "If-Match": stale})
+    assert response.status_code == 412
+    assert response.json["version"] == 2
+
+    response = client.get(f"/api/task/{task_id}", headers=lead)
+    assert response.json["message"]["task"]["description"] == "task"
+    current = response.headers["ETag"]
+
+    response = client.delete(f"/api/task/{task_id}", headers={**lead, "If-Match": current})
+    assert response.status_code == 204
+    assert client.get(f"/api/task/{task_id}", headers=lead).status_code == 404
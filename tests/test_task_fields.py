@@ -0,0 +1,24 @@
+from simple_crud_api.utils.user import UserType
+
+
+def test_fields_are_the_columns_of_the_queried_model(app, make_user):
+    client = app.test_client()
+    _, manager = make_user("manager", UserType.Manager)
+    response = client.post("/api/task", json={"description": "task", "body": "body"}, headers=manager)
+    task_id = response.json["message"]["task"]["id"]
+
+    response = client.get("/api/task", query_string={"fields": "id,status"}, headers=manager)
+    assert response.status_code == 200
+    assert response.json["tasks"] == [{"id": task_id, "status": "not-started"}]
+
+    # not returned by the task serializer
+    for url in ("/api/task", f"/api/task/{task_id}"):
+        response = client.get(url, query_string={"fields": "id,change_seq"}, headers=manager)
+        assert response.status_code == 400
+    response = client.get("/api/task", query_string={"fields": "archived_at"}, headers=manager)
+    assert response.status_code == 400
+
+    response = client.get("/api/task", query_string={"archived": "1", "fields": "id,archived_at"}, headers=manager)
+    assert response.status_code == 200
+    response = client.get("/api/task", query_string={"archived": "1", "fields": "change_seq"}, headers=manager)
+    assert response.status_code == 400
@@ -0,0 +1,31 @@
+from simple_crud_api.utils.user import UserType
+
+
+def test_new_task_reusing_a_deleted_id_is_not_served_from_the_cache(app, make_user):
+    """
+    SQLite gives a new task the id of the deleted last one, the list shows
+    the new task, not the cached JSON of the deleted one.
+    """
+    client = app.test_client()
+    _, manager = make_user("manager", UserType.Manager)
+
+    for description in ("first", "deleted"):
+        response = client.post("/api/task", json={"description": description, "body": description}, headers=manager)
+        assert response.status_code == 201
+    deleted_id = response.json["message"]["task"]["id"]
+
+    # caches the JSON of both tasks
+    response = client.get("/api/task", headers=manager)
+    assert [t["description"] for t in response.json["tasks"]] == ["first", "deleted"]
+
+    response = client.delete(f"/api/task/{deleted_id}", headers=manager)
+    assert response.status_code == 204
+
+    response = client.post("/api/task", json={"description": "created", "body": "created"}, headers=manager)
+    assert response.status_code == 201
+    assert response.json["message"]["task"]["id"] == deleted_id
+
+    response = client.get("/api/task", headers=manager)
+    tasks = {t["id"]: t for t in response.json["tasks"]}
+    assert tasks[deleted_id]["description"] == "created"
+    assert tasks[deleted_id]["body"] == "created"
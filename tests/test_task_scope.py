@@ -0,0 +1,72 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from simple_crud_api.utils.user import UserType
+
+
+def test_role_scope_does_not_leak_between_concurrent_requests(app, make_user):
+    """
+    Concurrent requests of users of every role, each response only has
+    the tasks of its caller.
+    """
+    client = app.test_client()
+    manager_id, manager = make_user("manager", UserType.Manager)
+    lead_ids, leads, employee_ids, employees = [], [], [], []
+    for i in range(2):
+        user_id, headers = make_user(f"lead{i}", UserType.TeamLead)
+        lead_ids.append(user_id)
+        leads.append(headers)
+    for i in range(4):
+        user_id, headers = make_user(f"employee{i}", UserType.Employee)
+        employee_ids.append(user_id)
+        employees.append(headers)
+
+    # 3 tasks per team lead, each assigned to one of the lead's employees
+    created_by, assigned_to = {}, {}
+    for lead in range(2):
+        response = client.post("/api/task/bulk", json=[
+            {"description": f"lead {lead} task {i}", "body": "body"} for i in range(3)
+        ], headers=leads[lead])
+        assert response.status_code == 201
+        for i, result in enumerate(response.json["results"]):
+            task_id = result["task"]["id"]
+            employee = lead * 2 + i % 2
+            response = client.get(f"/api/task/{task_id}/assign/{employee_ids[employee]}", headers=leads[lead])
+            assert response.status_code == 200
+            created_by[task_id] = lead
+            assigned_to[task_id] = employee
+
+    callers = [("manager", None, manager)]
+    callers += [("lead", i, headers) for i, headers in enumerate(leads)]
+    callers += [("employee", i, headers) for i, headers in enumerate(employees)]
+
+    def expected_tasks(role: str, index: int | None) -> set[int]:
+        if role == "manager":
+            return set(created_by)
+        if role == "lead":
+            return {t for t, lead in created_by.items() if lead == index}
+        return {t for t, employee in assigned_to.items() if employee == index}
+
+    def request(seed: int) -> list[str]:
+        errors = []
+        rng = random.Random(seed)
+        for _ in range(20):
+            role, index, headers = rng.choice(callers)
+            expected = expected_tasks(role, index)
+
+            response = client.get("/api/task", headers=headers)
+            got = {t["id"] for t in response.json["tasks"]}
+            if response.status_code != 200 or got != expected:
+                errors.append(f"{role} {index} list: {sorted(got)} != {sorted(expected)}")
+
+            task_id = rng.choice(list(created_by))
+            response = client.get(f"/api/task/{task_id}", headers=headers)
+            expected_status = 302 if task_id in expected else 403
+            if response.status_code != expected_status:
+                errors.append(f"{role} {index} task {task_id}: {response.status_code} != {expected_status}")
+        return errors
+
+    with ThreadPoolExecutor(8) as executor:
+        errors = [e for result in executor.map(request, range(16)) for e in result]
+
+    assert errors == []
@@ -0,0 +1,26 @@
+from simple_crud_api.utils.search import boolean_mode_query, fts_query
+from simple_crud_api.utils.user import UserType
+
+
+def test_search_matches_tasks_with_all_the_words(app, make_user):
+    client = app.test_client()
+    _, manager = make_user("manager", UserType.Manager)
+    response = client.post("/api/task/bulk", json=[
+        {"description": "fix login", "body": "form crashes"},
+        {"description": "fix logout", "body": "button"},
+        {"description": "login page", "body": "new design"},
+    ], headers=manager)
+    assert response.status_code == 201
+
+    response = client.get("/api/task/search", query_string={"q": "fix login"}, headers=manager)
+    assert [t["description"] for t in response.json["tasks"]] == ["fix login"]
+
+    # OR is a word to find, not an operator
+    response = client.get("/api/task/search", query_string={"q": "login OR logout"}, headers=manager)
+    assert response.json["tasks"] == []
+
+
+def test_mysql_query_requires_every_quoted_term_like_fts5():
+    q = 'fix -login "bug* +x'
+    assert fts_query(q) == '"fix" "-login" """bug*" "+x"'
+    assert boolean_mode_query(q) == '+"fix" +"-login" +"bug*" +"+x"'
@@ -0,0 +1,52 @@
+from simple_crud_api.utils.user import UserType
+
+
+def sync_all(client, headers, token: str, limit: int) -> tuple[list[dict], list[int], str, int]:
+    """
+    Sync pages from `token` until `has_more` is false, returns the tasks, 
+    deleted ids, the last sync token and the number of pages.
+    """
+    tasks, deleted, pages = [], [], 0
+    while True:
+        response = client.get("/api/task", query_string={"since": token, "limit": limit}, headers=headers)
+        assert response.status_code == 200
+        assert len(response.json["tasks"]) + len(response.json["deleted"]) <= limit
+        tasks += response.json["tasks"]
+        deleted += response.json["deleted"]
+        token = response.json["sync_token"]
+        pages += 1
+        if not response.json["has_more"]:
+            return tasks, deleted, token, pages
+
+
+def test_full_sync_is_paged(app, make_user):
+    """
+    A full sync and a delta sync come in pages of `limit` changes, tasks 
+    changed together (same change sequence number) are split across pages
+    without being skipped or repeated.
+    """
+    client = app.test_client()
+    _, manager = make_user("manager", UserType.Manager)
+    response = client.post("/api/task/bulk", json=[
+        {"description": f"task {i}", "body": "body"} for i in range(7)
+    ], headers=manager)
+    assert response.status_code == 201
+    ids = [result["task"]["id"] for result in response.json["results"]]
+
+    tasks, deleted, token, pages = sync_all(client, manager, "0", 3)
+    assert [t["id"] for t in tasks] == ids
+    assert deleted == []
+    assert pages == 3
+
+    client.delete(f"/api/task/{ids[0]}", headers=manager)
+    client.put(f"/api/task/{ids[1]}", json={"status": "in-progress"}, headers=manager)
+    response = client.patch("/api/task/bulk", json={"ids": ids[2:5], "status": "done"}, headers=manager)
+    assert response.status_code == 202
+
+    tasks, deleted, token, pages = sync_all(client, manager, token, 2)
+    assert deleted == [ids[0]]
+    assert [t["id"] for t in tasks] == ids[1:5]
+    assert pages == 3
+
+    tasks, deleted, _, _ = sync_all(client, manager, token, 2)
+    assert tasks == [] and deleted == []
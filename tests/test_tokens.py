@@ -0,0 +1,53 @@
+from flask_jwt_extended import create_access_token
+from sqlalchemy import update
+
+from simple_crud_api import database
+from simple_crud_api.models.user import User
+from simple_crud_api.utils.tokens import token_revocations
+from simple_crud_api.utils.user import UserType
+
+
+def test_password_reset_revokes_issued_tokens(app, make_user):
+    client = app.test_client()
+    user_id, headers = make_user("employee", UserType.Employee)
+    with app.app_context():
+        user = database.db_session.get(User, user_id)
+        other = {"Authorization": f"Bearer {create_access_token(identity=user, fresh=True)}"}
+    database.db_session.remove()
+
+    assert client.get("/api/task", headers=other).status_code == 200
+    response = client.post(
+        "/api/auth/password-reset", 
+        json={"last_password": "Password123", "new_password": "Password456"}, 
+        headers=headers
+    )
+    assert response.status_code == 202
+
+    # task views authorize from the token claims, user views load the user
+    for url in ("/api/task", "/api/user"):
+        for old in (headers, other):
+            response = client.get(url, headers=old)
+            assert response.status_code == 401
+            assert response.json["msg"] == "Token has been revoked"
+
+    response = client.post("/api/auth/login", json={"username": "employee", "password": "Password456"})
+    assert response.status_code == 200
+
+
+def test_token_version_bumped_by_another_process_is_picked_up(app, make_user):
+    """
+    A revocation made elsewhere applies once the revocations are reloaded
+    (every `TOKEN_REVOCATION_REFRESH_INTERVAL`).
+    """
+    client = app.test_client()
+    user_id, headers = make_user("lead", UserType.TeamLead)
+    assert client.get("/api/task", headers=headers).status_code == 200
+
+    database.db_session.execute(update(User).where(User.id == user_id).values(token_version=1))
+    database.db_session.commit()
+    # still valid until the reload
+    assert client.get("/api/task", headers=headers).status_code == 200
+
+    token_revocations.expires_at = 0.0
+    assert client.get("/api/task", headers=headers).status_code == 401
+    assert token_revocations.versions == {user_id: 1}
@@ -0,0 +1,117 @@
+import hashlib
+import hmac
+import json
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+
+import pytest
+from sqlalchemy import select, update
+
+from simple_crud_api import database, settings
+from simple_crud_api.models.task import utcnow
+from simple_crud_api.models.task_outbox import TaskOutbox
+from simple_crud_api.utils.user import UserType
+from simple_crud_api.utils.webhooks import WebhookDispatcher
+
+
+SECRET = "webhook-secret"
+
+
+class WebhookStub(ThreadingHTTPServer):
+    """
+    Local webhook receiver, records the requests and answers the given
+    status codes in turn, then 200.
+    """
+
+    def __init__(self, statuses: list[int]):
+        super().__init__(("127.0.0.1", 0), WebhookStubHandler)
+        self.statuses = list(statuses)
+        self.requests = []
+        self.lock = Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/hook"
+
+
+class WebhookStubHandler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        with self.server.lock:
+            status = self.server.statuses.pop(0) if self.server.statuses else 200
+            self.server.requests.append((dict(self.headers), body, status))
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def webhook(monkeypatch):
+    # the first request fails
+    server = WebhookStub([500])
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(settings, "TASK_WEBHOOK_URLS", server.url)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def get_outbox() -> list:
+    rows = database.db_session.execute(select(TaskOutbox).order_by(TaskOutbox.id)).scalars().all()
+    database.db_session.commit()
+    return rows
+
+
+def test_dispatcher_signs_retries_and_keeps_task_order(app, make_user, webhook):
+    client = app.test_client()
+    _, manager = make_user("manager", UserType.Manager)
+
+    first_id = client.post("/api/task", json={"description": "first", "body": "b"}, headers=manager).json["message"]["task"]["id"]
+    for status in ("in-progress", "completed"):
+        response = client.put(f"/api/task/{first_id}", json={"status": status}, headers=manager)
+        assert response.status_code == 202
+    second_id = client.post("/api/task", json={"description": "second", "body": "b"}, headers=manager).json["message"]["task"]["id"]
+    assert len(get_outbox()) == 4
+
+    dispatcher = WebhookDispatcher(SECRET)
+    # the create of each task, the first one fails
+    assert dispatcher.dispatch() == 2
+    assert [status for _, _, status in webhook.requests] == [500, 200]
+
+    outbox = get_outbox()
+    assert [row.task_id for row in outbox] == [first_id] * 3
+    failed = outbox[0]
+    assert failed.attempts == 1 and failed.failed_at is None
+    delay = failed.next_attempt_at - utcnow()
+    assert timedelta(0) < delay <= timedelta(seconds=dispatcher.retry_delay)
+
+    # backing off, the later changes of the task wait for the failed one
+    assert dispatcher.dispatch() == 0
+
+    database.db_session.execute(update(TaskOutbox).values(next_attempt_at=utcnow()))
+    database.db_session.commit()
+    while dispatcher.dispatch():
+        pass
+
+    assert get_outbox() == []
+    received = []
+    for headers, body, status in webhook.requests:
+        expected = hmac.new(
+            SECRET.encode(), headers["X-Webhook-Timestamp"].encode() + b"." + body, hashlib.sha256
+        ).hexdigest()
+        assert headers["X-Webhook-Signature"] == f"sha256={expected}"
+        payload = json.loads(body)
+        if status == 200:
+            received.append((payload["task_id"], payload["action"], payload["task"]["status"]))
+    assert [r for r in received if r[0] == first_id] == [
+        (first_id, "create", "not-started"),
+        (first_id, "update", "in-progress"),
+        (first_id, "update", "completed"),
+    ]
+    assert [r for r in received if r[0] == second_id] == [(second_id, "create", "not-started")]